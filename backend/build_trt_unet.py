@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Build an INT8 TensorRT engine for the SDXL Turbo UNet used by sd_server.py
+
+Steps:
+  1. Quantize the UNet with NVIDIA ModelOpt (INT8 post-training quantization,
+     percentile-calibrated by running the pipeline on sample prompts, with
+     sensitive layers kept in FP16), then check output PSNR against FP16
+  2. Export the quantized UNet to ONNX
+  3. Build a TensorRT engine with trtexec
+
+Usage:
+  python build_trt_unet.py --output unet.plan
+  SD_TRT_UNET_ENGINE=unet.plan python sd_server.py
+
+Requires nvidia-modelopt, onnx and TensorRT (trtexec on PATH). Engines are
+tied to the GPU and TensorRT version they were built with.
+"""
+
+import argparse
+import logging
+import math
+import shutil
+import subprocess
+from pathlib import Path
+
+import torch
+import modelopt.torch.quantization as mtq
+from modelopt.torch.quantization.calib import HistogramCalibrator
+from modelopt.torch.quantization.nn import TensorQuantizer
+from diffusers import StableDiffusionXLPipeline, AutoencoderKL
+
+from sd_server import MODEL_ID, VAE_ID, IMAGE_WIDTH, IMAGE_HEIGHT, MAX_BATCH_SIZE, MAX_STEPS, TRTUNet
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Representative prompts for INT8 range calibration
+CALIBRATION_PROMPTS = [
+    "Photorealistic office with laptops and coffee",
+    "Industrial robot arm picking boxes from a conveyor belt in a warehouse",
+    "Surgical robot operating room with bright overhead lights",
+    "Autonomous car driving on a city street at dusk",
+    "Quadcopter drone flying between warehouse shelves",
+    "Kitchen counter with fruit, glasses and a wooden cutting board",
+    "Laboratory bench with beakers, microscopes and cables",
+    "Living room with a sofa, bookshelf and a large window",
+]
+
+# Activation ranges clip at this percentile of the calibration histogram;
+# max calibration lets rare outliers stretch the range and crush everything else
+CALIBRATION_PERCENTILE = 99.99
+
+# Layers ModelOpt's diffusion recipe keeps in FP16: the latent in/out convs,
+# skip-path convs and the timestep/added-condition embeddings are too
+# sensitive for INT8 and cost little to leave unquantized
+SENSITIVE_LAYERS = ("conv_in", "conv_out", "conv_shortcut", "time_embedding", "time_emb_proj", "add_embedding")
+
+# Prompts compared between FP16 and INT8 UNets after calibration
+QUALITY_CHECK_PROMPTS = CALIBRATION_PROMPTS[:2]
+QUALITY_CHECK_SEED = 0
+MIN_PSNR_DB = 25.0
+
+LATENT_HEIGHT = IMAGE_HEIGHT // 8
+LATENT_WIDTH = IMAGE_WIDTH // 8
+
+class UNetExportWrapper(torch.nn.Module):
+    """Flattens SDXL's added_cond_kwargs into positional ONNX inputs"""
+
+    def __init__(self, unet):
+        super().__init__()
+        self.unet = unet
+
+    def forward(self, sample, timestep, encoder_hidden_states, text_embeds, time_ids):
+        return self.unet(
+            sample,
+            timestep,
+            encoder_hidden_states=encoder_hidden_states,
+            added_cond_kwargs={"text_embeds": text_embeds, "time_ids": time_ids},
+            return_dict=False,
+        )[0]
+
+def load_pipeline():
+    """Load the same SDXL Turbo pipeline sd_server.py serves"""
+    vae = AutoencoderKL.from_pretrained(VAE_ID, torch_dtype=torch.float16)
+    pipe = StableDiffusionXLPipeline.from_pretrained(
+        MODEL_ID,
+        vae=vae,
+        torch_dtype=torch.float16,
+        variant="fp16",
+        use_safetensors=True
+    )
+    return pipe.to("cuda")
+
+def int8_config():
+    """INT8 config following ModelOpt's diffusion recipe
+
+    Per-channel weights, per-tensor activations with a histogram calibrator
+    (ranges are read off at CALIBRATION_PERCENTILE), sensitive layers left
+    in FP16. Calibration is run by quantize_unet, so no algorithm is set.
+    """
+    quant_cfg = {
+        "*weight_quantizer": {"num_bits": 8, "axis": 0},
+        "*input_quantizer": {"num_bits": 8, "axis": None, "calibrator": "histogram"},
+        "*output_quantizer": {"enable": False},
+        "default": {"enable": False},
+    }
+    for layer in SENSITIVE_LAYERS:
+        quant_cfg[f"*{layer}*"] = {"enable": False}
+    return {"quant_cfg": quant_cfg, "algorithm": None}
+
+def generate_reference(pipe):
+    """Fixed-seed images for comparing the UNet before and after quantization"""
+    return pipe(
+        prompt=QUALITY_CHECK_PROMPTS,
+        num_inference_steps=MAX_STEPS,
+        guidance_scale=0.0,
+        width=IMAGE_WIDTH,
+        height=IMAGE_HEIGHT,
+        generator=torch.Generator("cuda").manual_seed(QUALITY_CHECK_SEED),
+        output_type="pt",
+    ).images
+
+def quantize_unet(pipe):
+    """INT8 post-training quantization of the UNet, calibrated on real denoising steps
+
+    Logs the PSNR of INT8 output against FP16 on QUALITY_CHECK_PROMPTS.
+    """
+    with torch.inference_mode():
+        reference = generate_reference(pipe)
+
+        mtq.quantize(pipe.unet, int8_config())
+        quantizers = [module for module in pipe.unet.modules()
+                      if isinstance(module, TensorQuantizer) and module.is_enabled]
+
+        # Collect statistics with quantization off, then load the clipped ranges
+        for quantizer in quantizers:
+            quantizer.disable_quant()
+            quantizer.enable_calib()
+
+        logger.info(f"Calibrating INT8 ranges on {len(CALIBRATION_PROMPTS)} prompts...")
+        for prompt in CALIBRATION_PROMPTS:
+            for steps in range(1, MAX_STEPS + 1):
+                pipe(
+                    prompt=prompt,
+                    num_inference_steps=steps,
+                    guidance_scale=0.0,
+                    width=IMAGE_WIDTH,
+                    height=IMAGE_HEIGHT,
+                )
+
+        for quantizer in quantizers:
+            if isinstance(quantizer._calibrator, HistogramCalibrator):
+                quantizer.load_calib_amax("percentile", percentile=CALIBRATION_PERCENTILE)
+            else:
+                quantizer.load_calib_amax()
+            quantizer.disable_calib()
+            quantizer.enable_quant()
+
+        quantized = generate_reference(pipe)
+
+    mse = torch.mean((quantized.float() - reference.float()) ** 2).item()
+    psnr = 10 * math.log10(1.0 / max(mse, 1e-10))
+    logger.info(f"INT8 vs FP16 output PSNR: {psnr:.1f} dB")
+    if psnr < MIN_PSNR_DB:
+        logger.warning(f"PSNR below {MIN_PSNR_DB} dB; INT8 output may be visibly degraded")
+
+def export_onnx(pipe, onnx_path):
+    """Export the quantized UNet with a dynamic batch dimension"""
+    cond_dim = pipe.text_encoder.config.hidden_size + pipe.text_encoder_2.config.hidden_size
+    pooled_dim = pipe.text_encoder_2.config.projection_dim
+
+    dummy_inputs = (
+        torch.randn(1, 4, LATENT_HEIGHT, LATENT_WIDTH, dtype=torch.float16, device="cuda"),
+        torch.tensor([999.0], device="cuda"),
+        torch.randn(1, 77, cond_dim, dtype=torch.float16, device="cuda"),
+        torch.randn(1, pooled_dim, dtype=torch.float16, device="cuda"),
+        torch.randn(1, 6, dtype=torch.float16, device="cuda"),
+    )
+    batch_inputs = [name for name in TRTUNet.INPUT_NAMES if name != "timestep"]
+    dynamic_axes = {name: {0: "batch"} for name in batch_inputs + [TRTUNet.OUTPUT_NAME]}
+
+    logger.info(f"Exporting ONNX to {onnx_path}...")
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    torch.onnx.export(
+        UNetExportWrapper(pipe.unet),
+        dummy_inputs,
+        str(onnx_path),
+        input_names=list(TRTUNet.INPUT_NAMES),
+        output_names=[TRTUNet.OUTPUT_NAME],
+        dynamic_axes=dynamic_axes,
+        opset_version=17,
+    )
+    return cond_dim, pooled_dim
+
+def shape_args(batch, cond_dim, pooled_dim):
+    """trtexec shape spec for one batch size"""
+    return ",".join([
+        f"sample:{batch}x4x{LATENT_HEIGHT}x{LATENT_WIDTH}",
+        "timestep:1",
+        f"encoder_hidden_states:{batch}x77x{cond_dim}",
+        f"text_embeds:{batch}x{pooled_dim}",
+        f"time_ids:{batch}x6",
+    ])
+
+def build_engine(onnx_path, engine_path, cond_dim, pooled_dim):
+    """Build the TensorRT engine (batch 1..MAX_BATCH_SIZE) with trtexec"""
+    command = [
+        "trtexec",
+        f"--onnx={onnx_path}",
+        "--fp16",
+        "--int8",
+        f"--saveEngine={engine_path}",
+        f"--minShapes={shape_args(1, cond_dim, pooled_dim)}",
+        f"--optShapes={shape_args(1, cond_dim, pooled_dim)}",
+        f"--maxShapes={shape_args(MAX_BATCH_SIZE, cond_dim, pooled_dim)}",
+    ]
+
+    if not shutil.which("trtexec"):
+        logger.warning("trtexec not found on PATH; run this to build the engine:")
+        print(" ".join(command))
+        return False
+
+    logger.info("Building TensorRT engine (this takes several minutes)...")
+    subprocess.run(command, check=True)
+    logger.info(f"Engine saved: {engine_path}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="unet.plan", help="TensorRT engine path")
+    parser.add_argument("--onnx", default="unet_onnx/unet.onnx", help="intermediate ONNX path")
+    args = parser.parse_args()
+
+    pipe = load_pipeline()
+    quantize_unet(pipe)
+    cond_dim, pooled_dim = export_onnx(pipe, Path(args.onnx))
+
+    if build_engine(args.onnx, args.output, cond_dim, pooled_dim):
+        print(f"\nStart the server with: SD_TRT_UNET_ENGINE={args.output} python sd_server.py")
+
+if __name__ == "__main__":
+    main()
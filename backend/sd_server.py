@@ -4,16 +4,55 @@ Stable Diffusion Image Generation Server for SnapLock
 Provides local photorealistic image generation without API restrictions
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+import os
+
+# Persist Inductor/Triton artifacts across restarts so torch.compile only
+# pays the full compile cost once per machine
+os.environ.setdefault(
+    "TORCHINDUCTOR_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".torchinductor_cache"),
+)
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+import uvicorn
 import torch
-from diffusers import StableDiffusionXLPipeline, DPMSolverMultistepScheduler
-import base64
+from diffusers import StableDiffusionXLPipeline, AutoencoderKL
+from diffusers.models.attention_processor import AttnProcessor2_0
 from io import BytesIO
+import asyncio
 import logging
-
-app = Flask(__name__)
-CORS(app)  # Enable CORS for React app
+import zipfile
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from PIL import Image
+
+# Float8WeightOnlyConfig needs torchao>=0.9, which in turn needs torch>=2.6;
+# older or mismatched installs can fail with more than ImportError
+try:
+    from torchao.quantization import quantize_, Float8WeightOnlyConfig
+    torchao_error = None
+except Exception as e:
+    quantize_ = None
+    torchao_error = e
+
+try:
+    import tensorrt as trt
+except ImportError:
+    trt = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError):  # module or libturbojpeg missing
+    turbo_jpeg = None
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +61,418 @@ logger = logging.getLogger(__name__)
 # Global pipeline variable
 pipe = None
 
+# Use SDXL Turbo for fast generation (1-4 steps)
+MODEL_ID = "stabilityai/sdxl-turbo"
+
+# SDXL's stock VAE overflows in FP16 and gets upcast to FP32 for decoding;
+# the fp16-fix checkpoint decodes in half precision without NaNs
+VAE_ID = "madebyollin/sdxl-vae-fp16-fix"
+
+# Optional INT8 TensorRT engine for the UNet (built with build_trt_unet.py)
+TRT_UNET_ENGINE = os.environ.get("SD_TRT_UNET_ENGINE")
+
+# Fixed output resolution used by every endpoint (16:9)
+IMAGE_WIDTH = 1024
+IMAGE_HEIGHT = 576
+
+# Requests are batched into a single pipeline call by a background worker
+MAX_BATCH_SIZE = 8       # images per pipeline call
+BATCH_WINDOW_S = 0.02    # how long to wait for more requests to join a batch
+
+# UNet batch sizes with a captured CUDA graph; other sizes are padded up
+CUDA_GRAPH_BATCH_SIZES = (1, 2, 4, MAX_BATCH_SIZE)
+
+# SDXL Turbo is distilled for 1-4 steps with its default EulerAncestral scheduler
+DEFAULT_STEPS = 1
+MAX_STEPS = 4
+
+def parse_steps(data):
+    """Read the requested step count, clamped to the range SDXL Turbo supports"""
+    try:
+        steps = int(data.get('steps', DEFAULT_STEPS))
+    except (TypeError, ValueError):
+        steps = DEFAULT_STEPS
+    return max(1, min(steps, MAX_STEPS))
+
+# Upper bound on images per /generate-batch request
+MAX_VARIATIONS = 4
+
+JPEG_QUALITY = 90
+
+# JPEG encoding runs here so it overlaps with the next batch's GPU work
+encode_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="jpeg-encode")
+copy_stream = None
+
+def encode_jpeg(pixels):
+    """Encode an RGB uint8 HxWx3 array to JPEG bytes (libjpeg-turbo directly when available)"""
+    if turbo_jpeg is not None:
+        return turbo_jpeg.encode(pixels, quality=JPEG_QUALITY, pixel_format=TJPF_RGB)
+
+    buffered = BytesIO()
+    Image.fromarray(pixels).save(buffered, format="JPEG", quality=JPEG_QUALITY)
+    return buffered.getvalue()
+
+def encode_zip(jpegs):
+    """Bundle JPEGs in a zip (stored, since JPEG is already compressed)"""
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for i, jpeg_bytes in enumerate(jpegs):
+            zf.writestr(f"image_{i}.jpg", jpeg_bytes)
+    return archive.getvalue()
+
+def copy_to_host(images):
+    """Queue a copy of a (B, 3, H, W) image batch in [0, 1] to host memory as uint8 HxWx3.
+
+    On CUDA the copy runs on a side stream into pinned memory (reused by
+    PyTorch's caching host allocator); returns the host tensor and an event
+    that marks the copy as finished.
+    """
+    global copy_stream
+
+    images = (images * 255).round_().clamp_(0, 255).to(torch.uint8).permute(0, 2, 3, 1).contiguous()
+    if not images.is_cuda:
+        return images.cpu(), None
+
+    if copy_stream is None:
+        copy_stream = torch.cuda.Stream()
+
+    host = torch.empty(images.shape, dtype=torch.uint8, pin_memory=True)
+    copy_stream.wait_stream(torch.cuda.current_stream())
+    with torch.cuda.stream(copy_stream):
+        host.copy_(images, non_blocking=True)
+        images.record_stream(copy_stream)
+        copied = torch.cuda.Event()
+        copied.record(copy_stream)
+    return host, copied
+
+def encode_frame(host, index, copied):
+    """Wait for the host copy, then JPEG-encode one image of the batch"""
+    if copied is not None:
+        copied.synchronize()
+    return encode_jpeg(host[index].numpy())
+
+def enable_fast_attention(pipe):
+    """Route attention through fused SDPA (flash / memory-efficient) kernels"""
+    if hasattr(torch.nn.functional, "scaled_dot_product_attention"):
+        pipe.unet.set_attn_processor(AttnProcessor2_0())
+        pipe.vae.set_attn_processor(AttnProcessor2_0())
+        logger.info("Using scaled_dot_product_attention")
+        return
+
+    try:
+        pipe.enable_xformers_memory_efficient_attention()
+        logger.info("Using xformers memory-efficient attention")
+    except (ImportError, ModuleNotFoundError):
+        logger.warning("No fused attention kernel available, using default attention")
+
+def quantize_weights(pipe):
+    """Quantize UNet and text encoder weights to FP8 (VAE stays in half precision)"""
+    if quantize_ is None:
+        logger.info(f"torchao FP8 unavailable ({torchao_error!r}), skipping weight quantization")
+        return
+
+    # FP8 Tensor Cores require Ada (SM 8.9) or newer
+    if torch.cuda.get_device_capability() < (8, 9):
+        logger.info("GPU does not support FP8, skipping weight quantization")
+        return
+
+    modules = [pipe.text_encoder, pipe.text_encoder_2]
+    if not isinstance(pipe.unet, TRTUNet):
+        modules.append(pipe.unet)
+    for module in modules:
+        quantize_(module, Float8WeightOnlyConfig())
+    logger.info("Quantized UNet and text encoders to FP8")
+
+class TRTUNet(torch.nn.Module):
+    """Runs the UNet through a prebuilt TensorRT engine (see build_trt_unet.py).
+
+    Only the UNet's config and its small add_embedding module are kept, since
+    the pipeline reads them to build SDXL's added conditioning; the PyTorch
+    UNet weights are released.
+    """
+
+    INPUT_NAMES = ("sample", "timestep", "encoder_hidden_states", "text_embeds", "time_ids")
+    OUTPUT_NAME = "out_sample"
+
+    def __init__(self, engine_path, unet):
+        super().__init__()
+        if trt is None:
+            raise RuntimeError("SD_TRT_UNET_ENGINE is set but tensorrt is not installed")
+
+        self.config = unet.config
+        self.add_embedding = unet.add_embedding
+
+        runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
+        with open(engine_path, "rb") as f:
+            self.engine = runtime.deserialize_cuda_engine(f.read())
+        self.context = self.engine.create_execution_context()
+
+    @property
+    def dtype(self):
+        return self.add_embedding.linear_1.weight.dtype
+
+    @property
+    def device(self):
+        return self.add_embedding.linear_1.weight.device
+
+    def forward(self, sample, timestep, encoder_hidden_states, added_cond_kwargs=None, return_dict=True, **kwargs):
+        inputs = dict(zip(self.INPUT_NAMES, (
+            sample,
+            torch.as_tensor(timestep, device=sample.device).reshape(1).float(),
+            encoder_hidden_states,
+            added_cond_kwargs["text_embeds"],
+            added_cond_kwargs["time_ids"],
+        )))
+        inputs = {name: tensor.contiguous() for name, tensor in inputs.items()}
+        out = torch.empty_like(inputs["sample"])
+
+        for name, tensor in inputs.items():
+            self.context.set_input_shape(name, tuple(tensor.shape))
+            self.context.set_tensor_address(name, tensor.data_ptr())
+        self.context.set_tensor_address(self.OUTPUT_NAME, out.data_ptr())
+        self.context.execute_async_v3(torch.cuda.current_stream().cuda_stream)
+
+        if return_dict:
+            from diffusers.models.unet_2d_condition import UNet2DConditionOutput
+            return UNet2DConditionOutput(sample=out)
+        return (out,)
+
+class CUDAGraphUNet(torch.nn.Module):
+    """Replays captured CUDA graphs of the UNet for fixed-shape denoising steps.
+
+    A graph is captured the first time each padded batch size is seen. Per
+    step, the latents, timestep and prompt embeddings are copied into static
+    input buffers and the graph is replayed, so embedding prep stays outside
+    the graph. Unsupported calls fall back to the wrapped UNet.
+    """
+
+    def __init__(self, unet):
+        super().__init__()
+        self.unet = unet
+        self.graphs = {}
+        self.pool = torch.cuda.graph_pool_handle()
+
+    def __getattr__(self, name):
+        # Expose config, dtype, add_embedding, etc. of the wrapped UNet
+        try:
+            return super().__getattr__(name)
+        except AttributeError:
+            return getattr(self.unet, name)
+
+    def forward(self, sample, timestep, encoder_hidden_states, added_cond_kwargs=None, return_dict=True, **kwargs):
+        batch = sample.shape[0]
+        bucket = next((size for size in CUDA_GRAPH_BATCH_SIZES if size >= batch), None)
+
+        if (bucket is None or return_dict or not added_cond_kwargs
+                or not torch.is_tensor(timestep) or timestep.ndim != 0
+                or any(value is not None for value in kwargs.values())):
+            return self.unet(sample, timestep, encoder_hidden_states,
+                             added_cond_kwargs=added_cond_kwargs, return_dict=return_dict, **kwargs)
+
+        inputs = {
+            "sample": sample,
+            "encoder_hidden_states": encoder_hidden_states,
+            "text_embeds": added_cond_kwargs["text_embeds"],
+            "time_ids": added_cond_kwargs["time_ids"],
+        }
+        key = (bucket,) + tuple(tuple(value.shape[1:]) for value in inputs.values())
+        if key not in self.graphs:
+            self.graphs[key] = self.capture(bucket, inputs, timestep)
+        graph, static_inputs, static_timestep, static_out = self.graphs[key]
+
+        for name, value in inputs.items():
+            static_inputs[name][:batch].copy_(value)
+        static_timestep.copy_(timestep)
+        graph.replay()
+
+        return (static_out[:batch].clone(),)
+
+    def capture(self, bucket, inputs, timestep):
+        """Capture one UNet forward for a padded batch size"""
+        logger.info(f"Capturing UNet CUDA graph for batch size {bucket}")
+
+        static_inputs = {}
+        for name, value in inputs.items():
+            static_inputs[name] = value.new_zeros((bucket, *value.shape[1:]))
+            static_inputs[name][:value.shape[0]].copy_(value)
+        static_timestep = timestep.clone()
+
+        def run():
+            return self.unet(
+                static_inputs["sample"],
+                static_timestep,
+                encoder_hidden_states=static_inputs["encoder_hidden_states"],
+                added_cond_kwargs={
+                    "text_embeds": static_inputs["text_embeds"],
+                    "time_ids": static_inputs["time_ids"],
+                },
+                return_dict=False,
+            )[0]
+
+        # Warm up on a side stream so lazy initialization is not captured
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream):
+            for _ in range(3):
+                run()
+        torch.cuda.current_stream().wait_stream(stream)
+
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph, pool=self.pool):
+            static_out = run()
+
+        return graph, static_inputs, static_timestep, static_out
+
+def to_channels_last(pipe):
+    """Store UNet and VAE conv weights as NHWC so cuDNN picks its Tensor Core kernels"""
+    modules = [pipe.vae]
+    if not isinstance(pipe.unet, TRTUNet):
+        modules.append(pipe.unet)
+
+    for module in modules:
+        module.to(memory_format=torch.channels_last)
+
+    conv_weight = next(p for p in modules[-1].parameters() if p.ndim == 4)
+    if conv_weight.is_contiguous(memory_format=torch.channels_last):
+        logger.info("UNet/VAE weights are channels_last")
+    else:
+        logger.warning("UNet/VAE weights did not switch to channels_last")
+
+def compile_pipeline(pipe):
+    """Compile UNet and VAE decoder with Inductor for faster denoising"""
+    # The UNet's CUDA graphs are captured explicitly by CUDAGraphUNet, so
+    # Inductor only fuses kernels here. A TensorRT UNet is already compiled.
+    if not isinstance(pipe.unet, TRTUNet):
+        pipe.unet = CUDAGraphUNet(torch.compile(pipe.unet, fullgraph=True))
+    pipe.vae.decode = torch.compile(pipe.vae.decode, mode="reduce-overhead", fullgraph=True)
+
+def warmup_pipeline(pipe):
+    """Run throwaway generations so compilation and graph capture happen off the request path"""
+    logger.info("Warming up pipeline (compiling kernels, capturing CUDA graphs)...")
+    with torch.inference_mode():
+        # The UNet pads to CUDA_GRAPH_BATCH_SIZES, but the compiled VAE decoder
+        # records a graph per exact batch size, so warm every size a batch can take
+        for batch_size in range(1, MAX_BATCH_SIZE + 1):
+            pipe(
+                prompt=["warmup"] * batch_size,
+                num_inference_steps=DEFAULT_STEPS,
+                guidance_scale=0.0,
+                width=IMAGE_WIDTH,
+                height=IMAGE_HEIGHT,
+            )
+    logger.info("Warm-up complete")
+
+@dataclass
+class GenerationRequest:
+    prompt: str
+    steps: int
+    count: int = 1
+    future: Future = field(default_factory=Future)
+
+pending = queue.Queue()
+
+def submit_generation(prompt, steps, count=1):
+    """Queue a prompt for the batch worker.
+
+    The future resolves to a list of futures, one per image, each yielding JPEG bytes.
+    """
+    req = GenerationRequest(prompt=prompt, steps=steps, count=count)
+    pending.put(req)
+    return req.future
+
+def collect_batch(first):
+    """Gather requests arriving within the batch window, up to MAX_BATCH_SIZE images.
+
+    Returns the batch and a request that did not fit (or None).
+    """
+    batch = [first]
+    size = first.count
+    deadline = time.monotonic() + BATCH_WINDOW_S
+
+    while size < MAX_BATCH_SIZE:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            break
+        try:
+            req = pending.get(timeout=timeout)
+        except queue.Empty:
+            break
+        if size + req.count > MAX_BATCH_SIZE:
+            return batch, req
+        batch.append(req)
+        size += req.count
+
+    return batch, None
+
+@lru_cache(maxsize=128)
+def encode_prompt(prompt):
+    """Run both SDXL text encoders once per distinct prompt"""
+    prompt_embeds, _, pooled_prompt_embeds, _ = pipe.encode_prompt(
+        prompt,
+        device=pipe.device,
+        do_classifier_free_guidance=False,
+    )
+    return prompt_embeds, pooled_prompt_embeds
+
+def run_batch(steps, batch):
+    """Generate images for all requests in a batch with one pipeline call"""
+    prompts = [req.prompt for req in batch for _ in range(req.count)]
+
+    try:
+        with torch.inference_mode():
+            # Repeat prompts (variations, retries) skip the text encoders
+            embeds = [encode_prompt(prompt) for prompt in prompts]
+            images = pipe(
+                prompt_embeds=torch.cat([prompt_embeds for prompt_embeds, _ in embeds]),
+                pooled_prompt_embeds=torch.cat([pooled for _, pooled in embeds]),
+                num_inference_steps=steps,
+                guidance_scale=0.0,     # SDXL Turbo doesn't use guidance
+                width=IMAGE_WIDTH,
+                height=IMAGE_HEIGHT,
+                output_type="pt",
+            ).images
+            host, copied = copy_to_host(images)
+    except Exception as e:
+        for req in batch:
+            req.future.set_exception(e)
+        return
+
+    # Encode in the background; the worker moves straight on to the next batch
+    frames = [encode_pool.submit(encode_frame, host, i, copied) for i in range(len(host))]
+    for req in batch:
+        req.future.set_result(frames[:req.count])
+        frames = frames[req.count:]
+
+def generation_worker(ready):
+    """Background loop that owns the GPU and serves queued requests in batches
+
+    Warm-up runs here rather than on the startup thread: Inductor's CUDA graph
+    trees keep per-thread state, so graphs captured elsewhere are not reused.
+    ready resolves once warm-up is done (or fails).
+    """
+    try:
+        if torch.cuda.is_available():
+            warmup_pipeline(pipe)
+    except Exception as e:
+        ready.set_exception(e)
+        return
+    ready.set_result(None)
+
+    leftover = None
+    while True:
+        first = leftover or pending.get()
+        batch, leftover = collect_batch(first)
+
+        # Requests can only share a pipeline call if they use the same step count
+        by_steps = {}
+        for req in batch:
+            by_steps.setdefault(req.steps, []).append(req)
+
+        for steps, group in by_steps.items():
+            if len(group) > 1:
+                logger.info(f"Batching {len(group)} requests ({steps} steps)")
+            run_batch(steps, group)
+
 def initialize_model():
     """Initialize Stable Diffusion XL model"""
     global pipe
@@ -31,20 +482,27 @@ def initialize_model():
 
     logger.info("Loading Stable Diffusion XL model...")
 
-    # Use SDXL Turbo for fast generation (2-4 steps)
-    model_id = "stabilityai/sdxl-turbo"
-
     try:
+        vae = AutoencoderKL.from_pretrained(VAE_ID, torch_dtype=torch.float16)
         pipe = StableDiffusionXLPipeline.from_pretrained(
-            model_id,
+            MODEL_ID,
+            vae=vae,
             torch_dtype=torch.float16,
             variant="fp16",
             use_safetensors=True
         )
 
+        enable_fast_attention(pipe)
+
         # Enable optimizations
         if torch.cuda.is_available():
             pipe = pipe.to("cuda")
+            if TRT_UNET_ENGINE:
+                pipe.unet = TRTUNet(TRT_UNET_ENGINE, pipe.unet)
+                logger.info(f"Using TensorRT UNet engine: {TRT_UNET_ENGINE}")
+            to_channels_last(pipe)
+            quantize_weights(pipe)
+            compile_pipeline(pipe)
             logger.info("Using GPU acceleration")
         elif torch.backends.mps.is_available():
             pipe = pipe.to("mps")
@@ -52,8 +510,9 @@ def initialize_model():
         else:
             logger.warning("Using CPU (will be slow)")
 
-        # Use fast scheduler
-        pipe.scheduler = DPMSolverMultistepScheduler.from_config(pipe.scheduler.config)
+        ready = Future()
+        threading.Thread(target=generation_worker, args=(ready,), name="generation-worker", daemon=True).start()
+        ready.result()
 
         logger.info("Model loaded successfully!")
 
@@ -61,101 +520,90 @@ def initialize_model():
         logger.error(f"Failed to load model: {e}")
         raise
 
-@app.route('/health', methods=['GET'])
-def health_check():
+@asynccontextmanager
+async def lifespan(app):
+    # Load at startup so the first request doesn't pay the model load
+    initialize_model()
+    yield
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(  # Enable CORS for React app
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+@app.get('/health')
+async def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return {
         "status": "healthy",
         "model_loaded": pipe is not None,
         "device": "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
-    })
+    }
 
-@app.route('/generate', methods=['POST'])
-def generate_image():
+@app.post('/generate')
+async def generate_image(request: Request):
     """Generate photorealistic image from text prompt"""
     try:
-        data = request.json
+        data = await request.json()
         prompt = data.get('prompt', '')
+        steps = parse_steps(data)
 
         if not prompt:
-            return jsonify({"error": "No prompt provided"}), 400
-
-        # Initialize model on first request
-        if pipe is None:
-            initialize_model()
+            return JSONResponse({"error": "No prompt provided"}, status_code=400)
 
         logger.info(f"Generating image for: {prompt[:100]}...")
 
-        # Generate image
-        # SDXL Turbo uses 1-4 steps for fast generation
-        image = pipe(
-            prompt=prompt,
-            num_inference_steps=4,  # Fast mode
-            guidance_scale=0.0,     # SDXL Turbo doesn't use guidance
-            width=1024,
-            height=576,  # 16:9 aspect ratio
-        ).images[0]
-
-        # Convert to base64
-        buffered = BytesIO()
-        image.save(buffered, format="PNG")
-        img_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
+        # Generate image (batched with concurrent requests by the worker)
+        frames = await asyncio.wrap_future(submit_generation(prompt, steps))
+        jpeg_bytes = await asyncio.wrap_future(frames[0])
 
         logger.info("Image generated successfully")
 
-        return jsonify({
-            "image": f"data:image/png;base64,{img_base64}",
-            "success": True
-        })
+        # Return the JPEG bytes directly (no base64/JSON wrapping)
+        return Response(content=jpeg_bytes, media_type='image/jpeg')
 
     except Exception as e:
         logger.error(f"Error generating image: {e}")
-        return jsonify({"error": str(e)}), 500
+        return JSONResponse({"error": str(e)}, status_code=500)
 
-@app.route('/generate-batch', methods=['POST'])
-def generate_batch():
+@app.post('/generate-batch')
+async def generate_batch(request: Request):
     """Generate multiple images (for variations)"""
     try:
-        data = request.json
+        data = await request.json()
         prompt = data.get('prompt', '')
-        count = min(data.get('count', 1), 4)  # Max 4 images
+        steps = parse_steps(data)
 
         if not prompt:
-            return jsonify({"error": "No prompt provided"}), 400
+            return JSONResponse({"error": "No prompt provided"}, status_code=400)
 
-        if pipe is None:
-            initialize_model()
+        try:
+            count = int(data.get('count', 1))
+        except (TypeError, ValueError):
+            return JSONResponse({"error": "count must be an integer"}, status_code=400)
+        count = max(1, min(count, MAX_VARIATIONS))
 
         logger.info(f"Generating {count} images for: {prompt[:100]}...")
 
         # Generate multiple images
-        images = pipe(
-            prompt=prompt,
-            num_inference_steps=4,
-            guidance_scale=0.0,
-            width=1024,
-            height=576,
-            num_images_per_prompt=count
-        ).images
-
-        # Convert all to base64
-        result_images = []
-        for img in images:
-            buffered = BytesIO()
-            img.save(buffered, format="PNG")
-            img_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
-            result_images.append(f"data:image/png;base64,{img_base64}")
-
-        return jsonify({
-            "images": result_images,
-            "success": True
-        })
+        frames = await asyncio.wrap_future(submit_generation(prompt, steps, count))
+        jpegs = await asyncio.gather(*(asyncio.wrap_future(frame) for frame in frames))
+        archive = encode_zip(jpegs)
+
+        return Response(
+            content=archive,
+            media_type='application/zip',
+            headers={"Content-Disposition": 'attachment; filename="images.zip"'},
+        )
 
     except Exception as e:
         logger.error(f"Error generating batch: {e}")
-        return jsonify({"error": str(e)}), 500
+        return JSONResponse({"error": str(e)}, status_code=500)
 
 if __name__ == '__main__':
     logger.info("Starting Stable Diffusion server...")
-    logger.info("Note: First request will be slow due to model loading")
-    app.run(host='0.0.0.0', port=5001, debug=False)
+    # One worker process: a single GPU context shared by all async connections
+    uvicorn.run(app, host='0.0.0.0', port=5001, workers=1, loop="auto")
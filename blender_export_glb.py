@@ -12,6 +12,8 @@ Or from within Blender:
 import bpy
 import sys
 import os
+import numpy as np
+from mathutils import Matrix
 
 def export_to_glb(output_path):
     """Export current Blender scene to GLB format"""
@@ -55,8 +57,14 @@ def export_to_glb(output_path):
         export_nla_strips=True,
         export_anim_single_armature=True,
 
-        # Optimize
-        export_draco_mesh_compression_enable=False,  # Disabled for compatibility
+        # Optimize: Draco geometry compression (decoded by drei's useGLTF)
+        export_draco_mesh_compression_enable=True,
+        export_draco_mesh_compression_level=7,
+        export_draco_position_quantization=14,
+        export_draco_normal_quantization=10,
+        export_draco_texcoord_quantization=12,
+        export_draco_color_quantization=10,
+        export_draco_generic_quantization=12,
         export_vertex_color='ACTIVE',
 
         # Skinning
@@ -84,23 +92,75 @@ def export_to_glb(output_path):
         for action in bpy.data.actions:
             print(f"  - {action.name}: {action.frame_range[1] - action.frame_range[0]} frames")
 
+def purge_orphans():
+    """Remove datablocks with no users in a single linear pass"""
+    # Users before what they use: removing an orphan mesh can orphan its
+    # materials, and removing a material can orphan its images
+    collections = (bpy.data.meshes, bpy.data.materials, bpy.data.images, bpy.data.actions)
+    removed = 0
+    for collection in collections:
+        for block in list(collection):
+            if block.users == 0:
+                collection.remove(block, do_unlink=True)
+                removed += 1
+    print(f"🧹 Removed {removed} unused datablocks")
+
+def center_origins():
+    """Move every mesh origin to its bounding-box center (ORIGIN_GEOMETRY / BOUNDS)"""
+    # Group objects by mesh so shared meshes are only shifted once
+    mesh_users = {}
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH':
+            mesh_users.setdefault(obj.data, []).append(obj)
+
+    for mesh, objects in mesh_users.items():
+        if mesh.library or not mesh.vertices:
+            continue
+
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+        co = co.reshape(-1, 3)
+        center = (co.min(axis=0) + co.max(axis=0)) / 2
+        if not center.any():
+            continue
+
+        co -= center
+        mesh.vertices.foreach_set('co', co.ravel())
+
+        # Evaluated geometry comes from the shape keys, so shift every key block too
+        if mesh.shape_keys:
+            for key_block in mesh.shape_keys.key_blocks:
+                key_co = np.empty(len(key_block.data) * 3, dtype=np.float32)
+                key_block.data.foreach_get('co', key_co)
+                key_co = key_co.reshape(-1, 3) - center
+                key_block.data.foreach_set('co', key_co.ravel())
+        mesh.update()
+
+        # Compensate object transforms so geometry (and children) stay in place
+        offset = Matrix.Translation(center.tolist())
+        offset_inv = offset.inverted()
+        for obj in objects:
+            obj.matrix_basis = obj.matrix_basis @ offset
+            for child in obj.children:
+                child.matrix_parent_inverse = offset_inv @ child.matrix_parent_inverse
+
 def optimize_scene():
     """Optimize scene for web/real-time rendering"""
 
     print("🔧 Optimizing scene...")
 
     # Set origin to geometry center for all objects
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
+    center_origins()
 
     # Remove unused data
-    bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    purge_orphans()
 
     # Set smooth shading on all meshes
-    for obj in bpy.data.objects:
-        if obj.type == 'MESH':
-            bpy.context.view_layer.objects.active = obj
-            bpy.ops.object.shade_smooth()
+    for mesh in bpy.data.meshes:
+        if mesh.library:
+            continue  # linked meshes are read-only
+        mesh.polygons.foreach_set('use_smooth', [True] * len(mesh.polygons))
+        mesh.update()
 
     print("✅ Optimization complete")
 
@@ -6,29 +6,66 @@ Run in Blender:
 """
 
 import bpy
+import bmesh
 import math
 
 # Clear scene
 bpy.ops.object.select_all(action='SELECT')
 bpy.ops.object.delete()
 
-def create_cube(name, size, location=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cube_add(size=size, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
+def link_object(name, mesh, location):
+    """Wrap a mesh in a new object linked into the active collection"""
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    bpy.context.collection.objects.link(obj)
     return obj
 
+def build_mesh(name, build):
+    """Create a mesh datablock from a bmesh construction callback"""
+    mesh = bpy.data.meshes.new(name)
+    bm = bmesh.new()
+    build(bm)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+def create_cube(name, size, location=(0, 0, 0)):
+    mesh = build_mesh(name, lambda bm: bmesh.ops.create_cube(bm, size=size))
+    return link_object(name, mesh, location)
+
 def create_cylinder(name, radius, depth, location=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cylinder_add(radius=radius, depth=depth, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+    mesh = build_mesh(name, lambda bm: bmesh.ops.create_cone(
+        bm, cap_ends=True, segments=32, radius1=radius, radius2=radius, depth=depth))
+    return link_object(name, mesh, location)
 
 def create_sphere(name, radius, location=(0, 0, 0)):
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=radius, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+    mesh = build_mesh(name, lambda bm: bmesh.ops.create_uvsphere(
+        bm, u_segments=32, v_segments=16, radius=radius))
+    return link_object(name, mesh, location)
+
+def create_instance(name, source, location=(0, 0, 0)):
+    """Create an object reusing source's mesh so identical parts export as one GLB mesh"""
+    return link_object(name, source.data, location)
+
+def set_linear_interpolation(obj):
+    """Make obj's keys LINEAR so constant-rate motion exports as two samples"""
+    for fcurve in obj.animation_data.action.fcurves:
+        for keyframe in fcurve.keyframe_points:
+            keyframe.interpolation = 'LINEAR'
+
+def keyframe_spin(obj, axis, angle, frame_start, frame_end):
+    """Key a constant-rate spin of angle radians about axis, one key per quarter turn
+
+    glTF stores rotations as quaternions, so keys whole turns apart would
+    export as no rotation at all; quarter-turn keys stay unambiguous while
+    remaining far fewer than one sample per frame.
+    """
+    steps = max(1, math.ceil(abs(angle) / (math.pi / 2)))
+    for step in range(steps + 1):
+        t = step / steps
+        obj.rotation_euler[axis] = angle * t
+        obj.keyframe_insert(data_path="rotation_euler", frame=frame_start + (frame_end - frame_start) * t)
+    set_linear_interpolation(obj)
 
 # ===== CAR BODY =====
 car_body = create_cube("CarBody", size=1, location=(0, 0, 0.5))
@@ -64,19 +101,16 @@ wheel_fl.rotation_euler[1] = math.pi / 2
 wheel_fl.data.materials.append(wheel_mat)
 
 # Front right wheel
-wheel_fr = create_cylinder("WheelFrontRight", radius=0.3, depth=0.15, location=(0.9, 0.7, 0.3))
+wheel_fr = create_instance("WheelFrontRight", wheel_fl, location=(0.9, 0.7, 0.3))
 wheel_fr.rotation_euler[1] = math.pi / 2
-wheel_fr.data.materials.append(wheel_mat)
 
 # Rear left wheel
-wheel_rl = create_cylinder("WheelRearLeft", radius=0.3, depth=0.15, location=(-0.9, -0.7, 0.3))
+wheel_rl = create_instance("WheelRearLeft", wheel_fl, location=(-0.9, -0.7, 0.3))
 wheel_rl.rotation_euler[1] = math.pi / 2
-wheel_rl.data.materials.append(wheel_mat)
 
 # Rear right wheel
-wheel_rr = create_cylinder("WheelRearRight", radius=0.3, depth=0.15, location=(-0.9, 0.7, 0.3))
+wheel_rr = create_instance("WheelRearRight", wheel_fl, location=(-0.9, 0.7, 0.3))
 wheel_rr.rotation_euler[1] = math.pi / 2
-wheel_rr.data.materials.append(wheel_mat)
 
 # ===== SENSORS (LIDAR, CAMERAS) =====
 
@@ -96,8 +130,7 @@ camera_sensor.data.materials.append(cam_mat)
 cam_left = create_cube("CameraLeft", size=0.06, location=(0, -0.65, 0.8))
 cam_left.data.materials.append(cam_mat)
 
-cam_right = create_cube("CameraRight", size=0.06, location=(0, 0.65, 0.8))
-cam_right.data.materials.append(cam_mat)
+cam_right = create_instance("CameraRight", cam_left, location=(0, 0.65, 0.8))
 
 # ===== PARENT HIERARCHY =====
 hood.parent = car_body
@@ -125,9 +158,8 @@ lane_mat = bpy.data.materials.new(name="LaneMaterial")
 lane_mat.diffuse_color = (1.0, 1.0, 1.0, 1.0)  # White
 lane_left.data.materials.append(lane_mat)
 
-lane_right = create_cube("LaneRight", size=0.5, location=(0, 1.0, 0.02))
+lane_right = create_instance("LaneRight", lane_left, location=(0, 1.0, 0.02))
 lane_right.scale = (100, 0.1, 0.05)
-lane_right.data.materials.append(lane_mat)
 
 # Traffic cones (obstacles)
 cone_mat = bpy.data.materials.new(name="ConeMaterial")
@@ -137,9 +169,8 @@ cone1 = create_cylinder("Cone1", radius=0.15, depth=0.5, location=(10, -0.5, 0.2
 cone1.scale = (1, 1, 1.5)
 cone1.data.materials.append(cone_mat)
 
-cone2 = create_cylinder("Cone2", radius=0.15, depth=0.5, location=(15, 0.5, 0.25))
+cone2 = create_instance("Cone2", cone1, location=(15, 0.5, 0.25))
 cone2.scale = (1, 1, 1.5)
-cone2.data.materials.append(cone_mat)
 
 # ===== ANIMATION - CAR DRIVING FORWARD =====
 fps = 30
@@ -156,31 +187,23 @@ car_body.keyframe_insert(data_path="location", frame=1)
 
 car_body.location = (25, 0, 0.5)
 car_body.keyframe_insert(data_path="location", frame=total_frames)
+set_linear_interpolation(car_body)
 
 # Animate wheels rotating
 for wheel in [wheel_fl, wheel_fr, wheel_rl, wheel_rr]:
-    wheel.rotation_euler[0] = 0
-    wheel.keyframe_insert(data_path="rotation_euler", frame=1)
-
-    wheel.rotation_euler[0] = 20 * math.pi  # Many rotations
-    wheel.keyframe_insert(data_path="rotation_euler", frame=total_frames)
+    keyframe_spin(wheel, 0, 20 * math.pi, 1, total_frames)  # Many rotations
 
 # Animate LIDAR sensor spinning
-lidar.rotation_euler[2] = 0
-lidar.keyframe_insert(data_path="rotation_euler", frame=1)
-
-lidar.rotation_euler[2] = 8 * math.pi  # Fast rotation
-lidar.keyframe_insert(data_path="rotation_euler", frame=total_frames)
+keyframe_spin(lidar, 2, 8 * math.pi, 1, total_frames)  # Fast rotation
 
 # ===== LIGHTING =====
-bpy.ops.object.light_add(type='SUN', location=(10, 0, 20))
-sun = bpy.context.active_object
-sun.data.energy = 3.0
+sun_data = bpy.data.lights.new(name="Sun", type='SUN')
+sun_data.energy = 3.0
+sun = link_object("Sun", sun_data, (10, 0, 20))
 sun.rotation_euler = (math.radians(45), 0, math.radians(30))
 
 # ===== CAMERA (following car) =====
-bpy.ops.object.camera_add(location=(5, -8, 4))
-camera = bpy.context.active_object
+camera = link_object("Camera", bpy.data.cameras.new(name="Camera"), (5, -8, 4))
 camera.rotation_euler = (math.radians(75), 0, math.radians(30))
 bpy.context.scene.camera = camera
 
@@ -190,28 +213,26 @@ camera.keyframe_insert(data_path="location", frame=1)
 
 camera.location = (30, -8, 4)
 camera.keyframe_insert(data_path="location", frame=total_frames)
+set_linear_interpolation(camera)
 
 # ===== EXPORT =====
 output_path = "/Users/dr.gretchenboria/snaplock/public/models/autonomous_vehicle.glb"
 
 # Select ONLY the vehicle components (not road, lanes, cones, lights, camera)
-bpy.ops.object.select_all(action='DESELECT')
-car_body.select_set(True)
-hood.select_set(True)
-roof.select_set(True)
-wheel_fl.select_set(True)
-wheel_fr.select_set(True)
-wheel_rl.select_set(True)
-wheel_rr.select_set(True)
-lidar.select_set(True)
-camera_sensor.select_set(True)
-cam_left.select_set(True)
-cam_right.select_set(True)
+vehicle_parts = [
+    car_body, hood, roof,
+    wheel_fl, wheel_fr, wheel_rl, wheel_rr,
+    lidar, camera_sensor, cam_left, cam_right,
+]
+for obj in vehicle_parts:
+    obj.select_set(True)
 
 bpy.ops.export_scene.gltf(
     filepath=output_path,
     export_format='GLB',
     export_animations=True,
+    export_force_sampling=False,  # Keep authored keys instead of one sample per frame
+    export_optimize_animation_size=True,
     export_yup=True,
     use_selection=True
 )
@@ -6,29 +6,62 @@ Run in Blender:
 """
 
 import bpy
+import bmesh
 import math
+from mathutils import Matrix
 
 # Clear scene
 bpy.ops.object.select_all(action='SELECT')
 bpy.ops.object.delete()
 
-def create_cube(name, size, location=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cube_add(size=size, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
+def link_object(name, mesh, location):
+    """Wrap a mesh in a new object linked into the active collection"""
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    bpy.context.collection.objects.link(obj)
     return obj
 
-def create_cylinder(name, radius, depth, location=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cylinder_add(radius=radius, depth=depth, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+def build_mesh(name, build):
+    """Create a mesh datablock from a bmesh construction callback"""
+    mesh = bpy.data.meshes.new(name)
+    bm = bmesh.new()
+    build(bm)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
 
-def create_torus(name, major_radius, minor_radius, location=(0, 0, 0)):
-    bpy.ops.mesh.primitive_torus_add(major_radius=major_radius, minor_radius=minor_radius, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+def create_cube(name, size, location=(0, 0, 0)):
+    mesh = build_mesh(name, lambda bm: bmesh.ops.create_cube(bm, size=size))
+    return link_object(name, mesh, location)
+
+def create_cylinder(name, radius, depth, location=(0, 0, 0)):
+    mesh = build_mesh(name, lambda bm: bmesh.ops.create_cone(
+        bm, cap_ends=True, segments=32, radius1=radius, radius2=radius, depth=depth))
+    return link_object(name, mesh, location)
+
+def create_instance(name, source, location=(0, 0, 0)):
+    """Create an object reusing source's mesh so identical parts export as one GLB mesh"""
+    return link_object(name, source.data, location)
+
+def set_linear_interpolation(obj):
+    """Make obj's keys LINEAR so constant-rate motion exports as two samples"""
+    for fcurve in obj.animation_data.action.fcurves:
+        for keyframe in fcurve.keyframe_points:
+            keyframe.interpolation = 'LINEAR'
+
+def keyframe_spin(obj, axis, angle, frame_start, frame_end):
+    """Key a constant-rate spin of angle radians about axis, one key per quarter turn
+
+    glTF stores rotations as quaternions, so keys whole turns apart would
+    export as no rotation at all; quarter-turn keys stay unambiguous while
+    remaining far fewer than one sample per frame.
+    """
+    steps = max(1, math.ceil(abs(angle) / (math.pi / 2)))
+    for step in range(steps + 1):
+        t = step / steps
+        obj.rotation_euler[axis] = angle * t
+        obj.keyframe_insert(data_path="rotation_euler", frame=frame_start + (frame_end - frame_start) * t)
+    set_linear_interpolation(obj)
 
 # ===== DRONE BODY =====
 body = create_cube("DroneBody", size=0.3, location=(0, 0, 2))
@@ -61,19 +94,16 @@ arm1.rotation_euler = (0, math.radians(90), math.radians(45))
 arm1.data.materials.append(arm_mat)
 
 # Arm 2 - Front left
-arm2 = create_cylinder("Arm2", radius=0.03, depth=0.6, location=(-0.35, 0.35, 2.0))
+arm2 = create_instance("Arm2", arm1, location=(-0.35, 0.35, 2.0))
 arm2.rotation_euler = (0, math.radians(90), math.radians(-45))
-arm2.data.materials.append(arm_mat)
 
 # Arm 3 - Rear left
-arm3 = create_cylinder("Arm3", radius=0.03, depth=0.6, location=(-0.35, -0.35, 2.0))
+arm3 = create_instance("Arm3", arm1, location=(-0.35, -0.35, 2.0))
 arm3.rotation_euler = (0, math.radians(90), math.radians(-135))
-arm3.data.materials.append(arm_mat)
 
 # Arm 4 - Rear right
-arm4 = create_cylinder("Arm4", radius=0.03, depth=0.6, location=(0.35, -0.35, 2.0))
+arm4 = create_instance("Arm4", arm1, location=(0.35, -0.35, 2.0))
 arm4.rotation_euler = (0, math.radians(90), math.radians(135))
-arm4.data.materials.append(arm_mat)
 
 # ===== MOTORS AND PROPELLERS =====
 motor_mat = bpy.data.materials.new(name="MotorMaterial")
@@ -84,6 +114,15 @@ prop_mat = bpy.data.materials.new(name="PropellerMaterial")
 prop_mat.diffuse_color = (0.1, 0.1, 0.1, 0.3)  # Translucent black
 prop_mat.blend_method = 'BLEND'
 
+def build_propeller(bm):
+    # Two crossed flat blades in one mesh so they rotate together
+    for blade_scale in ((0.25, 0.02, 0.005), (0.02, 0.25, 0.005)):  # Long, thin blades
+        bmesh.ops.create_cube(bm, size=1, matrix=Matrix.Diagonal((*blade_scale, 1)))
+
+# One propeller mesh shared by all four propellers
+prop_mesh = build_mesh("PropellerMesh", build_propeller)
+prop_mesh.materials.append(prop_mat)
+
 motor_positions = [
     (0.55, 0.55, 2.0),   # Front right
     (-0.55, 0.55, 2.0),  # Front left
@@ -96,28 +135,16 @@ propellers = []
 
 for i, pos in enumerate(motor_positions):
     # Motor
-    motor = create_cylinder(f"Motor{i+1}", radius=0.06, depth=0.08, location=pos)
-    motor.data.materials.append(motor_mat)
+    if motors:
+        motor = create_instance(f"Motor{i+1}", motors[0], location=pos)
+    else:
+        motor = create_cylinder(f"Motor{i+1}", radius=0.06, depth=0.08, location=pos)
+        motor.data.materials.append(motor_mat)
     motors.append(motor)
 
     # Propeller blades (2 flat blades instead of torus ring)
     prop_pos = (pos[0], pos[1], pos[2] + 0.05)
-
-    # Create propeller as two crossed flat blades
-    bpy.ops.mesh.primitive_cube_add(size=1, location=prop_pos)
-    prop = bpy.context.active_object
-    prop.name = f"Propeller{i+1}"
-    prop.scale = (0.25, 0.02, 0.005)  # Long, thin blade
-    prop.data.materials.append(prop_mat)
-
-    # Second blade perpendicular to first
-    bpy.ops.mesh.primitive_cube_add(size=1, location=prop_pos)
-    blade2 = bpy.context.active_object
-    blade2.name = f"Blade2_{i+1}"
-    blade2.scale = (0.02, 0.25, 0.005)
-    blade2.data.materials.append(prop_mat)
-    blade2.parent = prop  # Parent to first blade so they rotate together
-
+    prop = link_object(f"Propeller{i+1}", prop_mesh, prop_pos)
     propellers.append(prop)
 
     # Parent propeller to motor
@@ -130,14 +157,11 @@ gear_mat.diffuse_color = (0.2, 0.2, 0.2, 1.0)
 gear1 = create_cylinder("Gear1", radius=0.015, depth=0.3, location=(0.3, 0.3, 1.7))
 gear1.data.materials.append(gear_mat)
 
-gear2 = create_cylinder("Gear2", radius=0.015, depth=0.3, location=(-0.3, 0.3, 1.7))
-gear2.data.materials.append(gear_mat)
+gear2 = create_instance("Gear2", gear1, location=(-0.3, 0.3, 1.7))
 
-gear3 = create_cylinder("Gear3", radius=0.015, depth=0.3, location=(-0.3, -0.3, 1.7))
-gear3.data.materials.append(gear_mat)
+gear3 = create_instance("Gear3", gear1, location=(-0.3, -0.3, 1.7))
 
-gear4 = create_cylinder("Gear4", radius=0.015, depth=0.3, location=(0.3, -0.3, 1.7))
-gear4.data.materials.append(gear_mat)
+gear4 = create_instance("Gear4", gear1, location=(0.3, -0.3, 1.7))
 
 # ===== PARENT HIERARCHY =====
 battery.parent = body
@@ -163,9 +187,8 @@ shelf_mat = bpy.data.materials.new(name="ShelfMaterial")
 shelf_mat.diffuse_color = (0.6, 0.4, 0.2, 1.0)  # Wood
 shelf1.data.materials.append(shelf_mat)
 
-shelf2 = create_cube("Shelf2", size=1, location=(3, 0, 1.5))
+shelf2 = create_instance("Shelf2", shelf1, location=(3, 0, 1.5))
 shelf2.scale = (0.5, 3, 3)
-shelf2.data.materials.append(shelf_mat)
 
 # ===== ANIMATION - DRONE FLIGHT =====
 fps = 30
@@ -194,13 +217,9 @@ body.keyframe_insert(data_path="location", frame=300)
 
 # Rotate propellers (fast spinning)
 for i, prop in enumerate(propellers):
-    prop.rotation_euler[2] = 0
-    prop.keyframe_insert(data_path="rotation_euler", frame=1)
-
     # Different speeds for stability (front CW, rear CCW pattern)
     direction = 1 if i % 2 == 0 else -1
-    prop.rotation_euler[2] = direction * 50 * math.pi  # 25 full rotations
-    prop.keyframe_insert(data_path="rotation_euler", frame=total_frames)
+    keyframe_spin(prop, 2, direction * 50 * math.pi, 1, total_frames)  # 25 full rotations
 
 # Camera gimbal movement (looking around)
 camera.rotation_euler[1] = 0
@@ -216,14 +235,13 @@ camera.rotation_euler[1] = 0
 camera.keyframe_insert(data_path="rotation_euler", frame=300)
 
 # ===== LIGHTING =====
-bpy.ops.object.light_add(type='AREA', location=(0, 0, 8))
-light = bpy.context.active_object
-light.data.energy = 500
-light.data.size = 10
+light_data = bpy.data.lights.new(name="Area", type='AREA')
+light_data.energy = 500
+light_data.size = 10
+light = link_object("Area", light_data, (0, 0, 8))
 
 # ===== CAMERA =====
-bpy.ops.object.camera_add(location=(6, -6, 4))
-cam = bpy.context.active_object
+cam = link_object("Camera", bpy.data.cameras.new(name="Camera"), (6, -6, 4))
 cam.rotation_euler = (math.radians(70), 0, math.radians(45))
 bpy.context.scene.camera = cam
 
@@ -231,27 +249,21 @@ bpy.context.scene.camera = cam
 output_path = "/Users/dr.gretchenboria/snaplock/public/models/drone_quadcopter.glb"
 
 # Select ONLY the drone components (not floor, shelves, lights, camera)
-bpy.ops.object.select_all(action='DESELECT')
-body.select_set(True)
-battery.select_set(True)
-camera.select_set(True)
-arm1.select_set(True)
-arm2.select_set(True)
-arm3.select_set(True)
-arm4.select_set(True)
-for motor in motors:
-    motor.select_set(True)
-for prop in propellers:
-    prop.select_set(True)
-gear1.select_set(True)
-gear2.select_set(True)
-gear3.select_set(True)
-gear4.select_set(True)
+drone_parts = [
+    body, battery, camera,
+    arm1, arm2, arm3, arm4,
+    *motors, *propellers,
+    gear1, gear2, gear3, gear4,
+]
+for obj in drone_parts:
+    obj.select_set(True)
 
 bpy.ops.export_scene.gltf(
     filepath=output_path,
     export_format='GLB',
     export_animations=True,
+    export_force_sampling=False,  # Keep authored keys instead of one sample per frame
+    export_optimize_animation_size=True,
     export_yup=True,
     use_selection=True
 )
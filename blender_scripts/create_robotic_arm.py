@@ -9,99 +9,200 @@ Or from Text Editor in Blender UI
 
 import bpy
 import math
-from mathutils import Vector, Euler
-
-# Clear existing scene
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete()
+import numpy as np
+from mathutils import Matrix, Vector, Euler
+
+# Clear existing scene (objects and the data they used) in one pass, no operators
+bpy.data.batch_remove([
+    *bpy.data.objects, *bpy.data.meshes, *bpy.data.materials,
+    *bpy.data.lights, *bpy.data.cameras, *bpy.data.actions,
+])
+
+# ===== PRIMITIVE GEOMETRY =====
+# Unit-sized vertex/face arrays, built once and scaled per object
+
+SEGMENTS = 32
+
+def unit_circle(segments):
+    """x, y coordinates of a unit circle sampled at segments points"""
+    angles = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)
+    return np.cos(angles), np.sin(angles)
+
+def pack_geometry(verts, faces):
+    """Flatten faces into the loop_start/loop_total/vertex_index arrays Mesh.foreach_set wants"""
+    totals = np.array([len(face) for face in faces], dtype=np.int32)
+    starts = np.zeros(len(faces), dtype=np.int32)
+    starts[1:] = np.cumsum(totals)[:-1]
+    return np.asarray(verts, dtype=np.float32), starts, totals, np.concatenate(faces).astype(np.int32)
+
+def cube_geometry():
+    """Cube of edge 1 centered on the origin"""
+    verts = [
+        (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, 0.5, -0.5), (-0.5, 0.5, -0.5),
+        (-0.5, -0.5, 0.5), (0.5, -0.5, 0.5), (0.5, 0.5, 0.5), (-0.5, 0.5, 0.5),
+    ]
+    faces = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+    return pack_geometry(verts, [np.array(face) for face in faces])
+
+def cylinder_geometry(segments=SEGMENTS):
+    """Cylinder of radius 1 and depth 1 along Z, centered on the origin"""
+    x, y = unit_circle(segments)
+    verts = np.vstack([
+        np.column_stack([x, y, np.full(segments, -0.5)]),
+        np.column_stack([x, y, np.full(segments, 0.5)]),
+    ])
+    i = np.arange(segments)
+    j = (i + 1) % segments
+    sides = np.column_stack([i, j, j + segments, i + segments])
+    return pack_geometry(verts, [*sides, i[::-1], i + segments])
+
+CUBE = cube_geometry()
+CYLINDER = cylinder_geometry()
+
+def build_mesh(name, geometry, scale):
+    """Create a mesh datablock from packed unit geometry scaled per axis"""
+    verts, starts, totals, indices = geometry
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", (verts * np.asarray(scale, dtype=np.float32)).ravel())
+    mesh.loops.add(len(indices))
+    mesh.loops.foreach_set("vertex_index", indices)
+    mesh.polygons.add(len(starts))
+    mesh.polygons.foreach_set("loop_start", starts)
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set("loop_total", totals)  # derived from loop_start since 4.0
+    mesh.update(calc_edges=True)
+    return mesh
+
+def link_object(name, data, location, collection=None, scale=(1, 1, 1)):
+    """Wrap object data (mesh, light, camera) in a new object linked into collection (default: the active one)"""
+    obj = bpy.data.objects.new(name, data)
+    obj.matrix_basis = Matrix.LocRotScale(Vector(location), None, Vector(scale))
+    (collection or bpy.context.collection).objects.link(obj)
+    return obj
 
-def create_cylinder(name, radius, depth, location=(0, 0, 0)):
+mesh_cache = {}
+
+def get_mesh(shape, geometry, scale):
+    """Return the mesh for shape at scale, building it once and sharing it between objects"""
+    key = (shape, tuple(scale))
+    if key not in mesh_cache:
+        mesh_cache[key] = build_mesh(shape, geometry, scale)
+    return mesh_cache[key]
+
+def assign_material(obj, material):
+    """Set obj's material on an object-linked slot so objects sharing a mesh can differ"""
+    if not obj.data.materials:
+        obj.data.materials.append(None)
+    slot = obj.material_slots[0]
+    slot.link = 'OBJECT'
+    slot.material = material
+
+material_cache = {}
+
+def get_material(name, rgba, metallic=0.0, roughness=0.4):
+    """Return a shared material for this color/finish, creating it on first use"""
+    key = (tuple(rgba), metallic, roughness)
+    if key not in material_cache:
+        mat = bpy.data.materials.new(name=name)
+        mat.diffuse_color = rgba
+        mat.metallic = metallic
+        mat.roughness = roughness
+        material_cache[key] = mat
+    return material_cache[key]
+
+def add_keyframes(obj, data_path, index, frames, values):
+    """Write one F-curve's keys in bulk instead of a keyframe_insert per key"""
+    if obj.animation_data is None:
+        obj.animation_data_create()
+    if obj.animation_data.action is None:
+        obj.animation_data.action = bpy.data.actions.new(name=f"{obj.name}Action")
+    fcurve = obj.animation_data.action.fcurves.new(data_path=data_path, index=index)
+    fcurve.keyframe_points.add(len(frames))
+    co = np.empty(2 * len(frames), dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    fcurve.keyframe_points.foreach_set("co", co)
+    fcurve.update()
+
+def create_cylinder(name, radius, depth, location=(0, 0, 0), collection=None, scale=(1, 1, 1)):
     """Helper to create cylinder"""
-    bpy.ops.mesh.primitive_cylinder_add(radius=radius, depth=depth, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+    return link_object(name, get_mesh("Cylinder", CYLINDER, (radius, radius, depth)), location, collection, scale)
 
-def create_cube(name, size, location=(0, 0, 0)):
+def create_cube(name, size, location=(0, 0, 0), collection=None, scale=(1, 1, 1)):
     """Helper to create cube"""
-    bpy.ops.mesh.primitive_cube_add(size=size, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+    return link_object(name, get_mesh("Cube", CUBE, (size, size, size)), location, collection, scale)
+
+# ===== ROBOT COLLECTION =====
+# Robot parts get their own collection so the export can take it as-is
+robot_coll = bpy.data.collections.new("Robot")
+bpy.context.scene.collection.children.link(robot_coll)
+
+# ===== MATERIALS =====
+base_mat = get_material("BaseMaterial", (0.3, 0.3, 0.3, 1.0))  # Dark gray
+joint_mat = get_material("JointMaterial", (0.8, 0.3, 0.1, 1.0))  # Orange
+link_mat = get_material("LinkMaterial", (0.2, 0.5, 0.8, 1.0))  # Blue
+gripper_mat = get_material("GripperMaterial", (0.1, 0.1, 0.1, 1.0))  # Black
+table_mat = get_material("TableMaterial", (0.6, 0.6, 0.6, 1.0))  # Gray
 
 # ===== CREATE 6-AXIS ROBOT ARM =====
 
 # Base (static platform)
-base = create_cylinder("RobotBase", radius=0.8, depth=0.3, location=(0, 0, 0.15))
-base_mat = bpy.data.materials.new(name="BaseMaterial")
-base_mat.diffuse_color = (0.3, 0.3, 0.3, 1.0)  # Dark gray
-base.data.materials.append(base_mat)
+base = create_cylinder("RobotBase", radius=0.8, depth=0.3, location=(0, 0, 0.15), collection=robot_coll)
+assign_material(base, base_mat)
 
 # Joint 1 - Base rotation (Y-axis rotation)
-joint1 = create_cylinder("Joint1", radius=0.5, depth=0.4, location=(0, 0, 0.5))
+joint1 = create_cylinder("Joint1", radius=0.5, depth=0.4, location=(0, 0, 0.5), collection=robot_coll)
 joint1.rotation_euler[0] = math.pi / 2  # Rotate to vertical
-joint1_mat = bpy.data.materials.new(name="Joint1Material")
-joint1_mat.diffuse_color = (0.8, 0.3, 0.1, 1.0)  # Orange
-joint1.data.materials.append(joint1_mat)
+assign_material(joint1, joint_mat)
 
 # Link 1 - First arm segment
-link1 = create_cube("Link1", size=0.3, location=(0, 0, 1.2))
-link1.scale = (0.8, 0.8, 2.5)
-link1_mat = bpy.data.materials.new(name="Link1Material")
-link1_mat.diffuse_color = (0.2, 0.5, 0.8, 1.0)  # Blue
-link1.data.materials.append(link1_mat)
+link1 = create_cube("Link1", size=0.3, location=(0, 0, 1.2), collection=robot_coll, scale=(0.8, 0.8, 2.5))
+assign_material(link1, link_mat)
 
 # Joint 2 - Shoulder
-joint2 = create_cylinder("Joint2", radius=0.4, depth=0.3, location=(0, 0, 2.2))
+joint2 = create_cylinder("Joint2", radius=0.4, depth=0.3, location=(0, 0, 2.2), collection=robot_coll)
 joint2.rotation_euler[0] = math.pi / 2
-joint2_mat = bpy.data.materials.new(name="Joint2Material")
-joint2_mat.diffuse_color = (0.8, 0.3, 0.1, 1.0)  # Orange
-joint2.data.materials.append(joint2_mat)
+assign_material(joint2, joint_mat)
 
 # Link 2 - Second arm segment (forearm)
-link2 = create_cube("Link2", size=0.25, location=(0, 0, 3.5))
-link2.scale = (0.7, 0.7, 2.0)
-link2_mat = bpy.data.materials.new(name="Link2Material")
-link2_mat.diffuse_color = (0.2, 0.5, 0.8, 1.0)  # Blue
-link2.data.materials.append(link2_mat)
+link2 = create_cube("Link2", size=0.25, location=(0, 0, 3.5), collection=robot_coll, scale=(0.7, 0.7, 2.0))
+assign_material(link2, link_mat)
 
 # Joint 3 - Elbow
-joint3 = create_cylinder("Joint3", radius=0.35, depth=0.25, location=(0, 0, 4.5))
+joint3 = create_cylinder("Joint3", radius=0.35, depth=0.25, location=(0, 0, 4.5), collection=robot_coll)
 joint3.rotation_euler[0] = math.pi / 2
-joint3_mat = bpy.data.materials.new(name="Joint3Material")
-joint3_mat.diffuse_color = (0.8, 0.3, 0.1, 1.0)  # Orange
-joint3.data.materials.append(joint3_mat)
+assign_material(joint3, joint_mat)
 
 # Link 3 - Wrist segment
-link3 = create_cube("Link3", size=0.2, location=(0, 0, 5.3))
-link3.scale = (0.6, 0.6, 1.2)
-link3_mat = bpy.data.materials.new(name="Link3Material")
-link3_mat.diffuse_color = (0.2, 0.5, 0.8, 1.0)  # Blue
-link3.data.materials.append(link3_mat)
+link3 = create_cube("Link3", size=0.2, location=(0, 0, 5.3), collection=robot_coll, scale=(0.6, 0.6, 1.2))
+assign_material(link3, link_mat)
 
 # Joint 4-6 - Wrist assembly
-joint4 = create_cylinder("Joint4", radius=0.25, depth=0.2, location=(0, 0, 5.9))
+joint4 = create_cylinder("Joint4", radius=0.25, depth=0.2, location=(0, 0, 5.9), collection=robot_coll)
 joint4.rotation_euler[0] = math.pi / 2
-joint4_mat = bpy.data.materials.new(name="Joint4Material")
-joint4_mat.diffuse_color = (0.8, 0.3, 0.1, 1.0)
-joint4.data.materials.append(joint4_mat)
+assign_material(joint4, joint_mat)
 
 # End effector (gripper simplified)
-gripper = create_cube("Gripper", size=0.15, location=(0, 0, 6.3))
-gripper.scale = (1.0, 1.0, 0.8)
-gripper_mat = bpy.data.materials.new(name="GripperMaterial")
-gripper_mat.diffuse_color = (0.1, 0.1, 0.1, 1.0)  # Black
-gripper.data.materials.append(gripper_mat)
+gripper = create_cube("Gripper", size=0.15, location=(0, 0, 6.3), collection=robot_coll, scale=(1.0, 1.0, 0.8))
+assign_material(gripper, gripper_mat)
 
 # ===== SETUP PARENT HIERARCHY =====
-joint1.parent = base
-link1.parent = joint1
-joint2.parent = link1
-link2.parent = joint2
-joint3.parent = link2
-link3.parent = joint3
-joint4.parent = link3
-gripper.parent = joint4
+# (child, parent) chain from base to gripper; parent inverses stay identity, so
+# each part's location is relative to its parent, and matrices refresh once at the end
+hierarchy = [
+    (joint1, base),
+    (link1, joint1),
+    (joint2, link1),
+    (link2, joint2),
+    (joint3, link2),
+    (link3, joint3),
+    (joint4, link3),
+    (gripper, joint4),
+]
+for child, parent in hierarchy:
+    child.parent = parent
+bpy.context.view_layer.update()
 
 # ===== CREATE ANIMATION =====
 # Animate robot performing pick-and-place operation
@@ -114,68 +215,35 @@ bpy.context.scene.frame_start = 1
 bpy.context.scene.frame_end = total_frames
 bpy.context.scene.render.fps = fps
 
-# Keyframe base rotation (Joint 1 - Y-axis rotation)
-joint1.rotation_euler[2] = 0  # Start at 0
-joint1.keyframe_insert(data_path="rotation_euler", frame=1)
+# Keyframe base rotation (Joint 1 - Y-axis rotation): 0 -> 90 degrees -> back to start
+add_keyframes(joint1, "rotation_euler", 2, frames=(1, 75, 150), values=(0, math.pi / 2, 0))
 
-joint1.rotation_euler[2] = math.pi / 2  # Rotate 90 degrees
-joint1.keyframe_insert(data_path="rotation_euler", frame=75)
-
-joint1.rotation_euler[2] = 0  # Return to start
-joint1.keyframe_insert(data_path="rotation_euler", frame=150)
-
-# Keyframe shoulder (Joint 2 - bend arm down/up)
-link1.rotation_euler[1] = 0
-link1.keyframe_insert(data_path="rotation_euler", frame=1)
-
-link1.rotation_euler[1] = -math.pi / 4  # Bend forward
-link1.keyframe_insert(data_path="rotation_euler", frame=50)
-
-link1.rotation_euler[1] = 0  # Return
-link1.keyframe_insert(data_path="rotation_euler", frame=100)
+# Keyframe shoulder (Joint 2 - bend arm forward and return)
+add_keyframes(link1, "rotation_euler", 1, frames=(1, 50, 100), values=(0, -math.pi / 4, 0))
 
 # Keyframe elbow (Joint 3)
-link2.rotation_euler[1] = 0
-link2.keyframe_insert(data_path="rotation_euler", frame=1)
-
-link2.rotation_euler[1] = math.pi / 3  # Bend elbow
-link2.keyframe_insert(data_path="rotation_euler", frame=60)
-
-link2.rotation_euler[1] = 0
-link2.keyframe_insert(data_path="rotation_euler", frame=110)
+add_keyframes(link2, "rotation_euler", 1, frames=(1, 60, 110), values=(0, math.pi / 3, 0))
 
 # ===== ADD WORKING SURFACE (TABLE) =====
-table = create_cube("WorkTable", size=1, location=(2, 0, 0.05))
-table.scale = (3, 2, 0.1)
-table_mat = bpy.data.materials.new(name="TableMaterial")
-table_mat.diffuse_color = (0.6, 0.6, 0.6, 1.0)  # Gray
-table.data.materials.append(table_mat)
+table = create_cube("WorkTable", size=1, location=(2, 0, 0.05), scale=(3, 2, 0.1))
+assign_material(table, table_mat)
 
 # ===== LIGHTING =====
-bpy.ops.object.light_add(type='SUN', location=(5, 5, 10))
-sun = bpy.context.active_object
-sun.data.energy = 2.0
+sun_data = bpy.data.lights.new(name="Sun", type='SUN')
+sun_data.energy = 2.0
+sun = link_object("Sun", sun_data, (5, 5, 10))
 
 # ===== CAMERA =====
-bpy.ops.object.camera_add(location=(8, -8, 6))
-camera = bpy.context.active_object
+camera = link_object("Camera", bpy.data.cameras.new(name="Camera"), (8, -8, 6))
 camera.rotation_euler = (math.radians(65), 0, math.radians(45))
 bpy.context.scene.camera = camera
 
 # ===== EXPORT GLB =====
 output_path = "/Users/dr.gretchenboria/snaplock/public/models/robotic_arm_6axis.glb"
 
-# Select ONLY the robot components (not table, lights, camera)
-bpy.ops.object.select_all(action='DESELECT')
-base.select_set(True)
-joint1.select_set(True)
-link1.select_set(True)
-joint2.select_set(True)
-link2.select_set(True)
-joint3.select_set(True)
-link3.select_set(True)
-joint4.select_set(True)
-gripper.select_set(True)
+# Export ONLY the robot collection (not table, lights, camera)
+view_layer = bpy.context.view_layer
+view_layer.active_layer_collection = view_layer.layer_collection.children[robot_coll.name]
 
 # Export to GLB
 bpy.ops.export_scene.gltf(
@@ -183,7 +251,7 @@ bpy.ops.export_scene.gltf(
     export_format='GLB',
     export_animations=True,
     export_yup=True,
-    use_selection=True
+    use_active_collection=True
 )
 
 print(f"✅ Created 6-Axis Industrial Robot Arm")
@@ -7,117 +7,244 @@ Run in Blender:
 
 import bpy
 import math
-from mathutils import Vector
-
-# Clear scene
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete()
-
-def create_cylinder(name, radius, depth, location=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cylinder_add(radius=radius, depth=depth, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
+import numpy as np
+from mathutils import Matrix, Vector
+
+# Clear scene (objects and the data they used) in one pass, no operators
+bpy.data.batch_remove([
+    *bpy.data.objects, *bpy.data.meshes, *bpy.data.materials,
+    *bpy.data.lights, *bpy.data.cameras, *bpy.data.actions,
+])
+
+# ===== PRIMITIVE GEOMETRY =====
+# Unit-sized vertex/face arrays, built once and scaled per object
+
+SEGMENTS = 32
+RINGS = 16
+
+def unit_circle(segments):
+    """x, y coordinates of a unit circle sampled at segments points"""
+    angles = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)
+    return np.cos(angles), np.sin(angles)
+
+def pack_geometry(verts, faces):
+    """Flatten faces into the loop_start/loop_total/vertex_index arrays Mesh.foreach_set wants"""
+    totals = np.array([len(face) for face in faces], dtype=np.int32)
+    starts = np.zeros(len(faces), dtype=np.int32)
+    starts[1:] = np.cumsum(totals)[:-1]
+    return np.asarray(verts, dtype=np.float32), starts, totals, np.concatenate(faces).astype(np.int32)
+
+def cylinder_geometry(segments=SEGMENTS):
+    """Cylinder of radius 1 and depth 1 along Z, centered on the origin"""
+    x, y = unit_circle(segments)
+    verts = np.vstack([
+        np.column_stack([x, y, np.full(segments, -0.5)]),
+        np.column_stack([x, y, np.full(segments, 0.5)]),
+    ])
+    i = np.arange(segments)
+    j = (i + 1) % segments
+    sides = np.column_stack([i, j, j + segments, i + segments])
+    return pack_geometry(verts, [*sides, i[::-1], i + segments])
+
+def cone_geometry(segments=SEGMENTS):
+    """Cone of base radius 1 and depth 1 along Z, apex up, centered on the origin"""
+    x, y = unit_circle(segments)
+    verts = np.vstack([np.column_stack([x, y, np.full(segments, -0.5)]), [(0.0, 0.0, 0.5)]])
+    i = np.arange(segments)
+    j = (i + 1) % segments
+    sides = np.column_stack([i, j, np.full(segments, segments)])
+    return pack_geometry(verts, [*sides, i[::-1]])
+
+def sphere_geometry(segments=SEGMENTS, rings=RINGS):
+    """UV sphere of radius 1 centered on the origin"""
+    x, y = unit_circle(segments)
+    theta = np.arange(1, rings) * np.pi / rings
+    ring_radius = np.sin(theta)[:, None]
+    ring_z = np.repeat(np.cos(theta)[:, None], segments, axis=1)
+    ring_verts = np.stack([ring_radius * x, ring_radius * y, ring_z], axis=-1).reshape(-1, 3)
+    verts = np.vstack([[(0.0, 0.0, 1.0)], ring_verts, [(0.0, 0.0, -1.0)]])
+
+    top, bottom = 0, len(verts) - 1
+    first, last = 1, 1 + (rings - 2) * segments
+    i = np.arange(segments)
+    j = (i + 1) % segments
+    faces = list(np.column_stack([np.full(segments, top), first + i, first + j]))
+    for upper in range(first, last, segments):
+        lower = upper + segments
+        faces.extend(np.column_stack([lower + i, lower + j, upper + j, upper + i]))
+    faces.extend(np.column_stack([np.full(segments, bottom), last + j, last + i]))
+    return pack_geometry(verts, faces)
+
+CYLINDER = cylinder_geometry()
+CONE = cone_geometry()
+SPHERE = sphere_geometry()
+
+def build_mesh(name, geometry, scale):
+    """Create a mesh datablock from packed unit geometry scaled per axis"""
+    verts, starts, totals, indices = geometry
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", (verts * np.asarray(scale, dtype=np.float32)).ravel())
+    mesh.loops.add(len(indices))
+    mesh.loops.foreach_set("vertex_index", indices)
+    mesh.polygons.add(len(starts))
+    mesh.polygons.foreach_set("loop_start", starts)
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set("loop_total", totals)  # derived from loop_start since 4.0
+    mesh.update(calc_edges=True)
+    return mesh
+
+def link_object(name, data, location, collection=None, scale=(1, 1, 1)):
+    """Wrap object data (mesh, light, camera) in a new object linked into collection (default: the active one)"""
+    obj = bpy.data.objects.new(name, data)
+    obj.matrix_basis = Matrix.LocRotScale(Vector(location), None, Vector(scale))
+    (collection or bpy.context.collection).objects.link(obj)
     return obj
 
-def create_cone(name, radius, depth, location=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cone_add(radius1=radius, depth=depth, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
-
-def create_sphere(name, radius, location=(0, 0, 0)):
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=radius, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
+mesh_cache = {}
+
+def get_mesh(shape, geometry, scale):
+    """Return the mesh for shape at scale, building it once and sharing it between objects"""
+    key = (shape, tuple(scale))
+    if key not in mesh_cache:
+        mesh_cache[key] = build_mesh(shape, geometry, scale)
+    return mesh_cache[key]
+
+def assign_material(obj, material):
+    """Set obj's material on an object-linked slot so objects sharing a mesh can differ"""
+    if not obj.data.materials:
+        obj.data.materials.append(None)
+    slot = obj.material_slots[0]
+    slot.link = 'OBJECT'
+    slot.material = material
+
+material_cache = {}
+
+def get_material(name, rgba, metallic=0.0, roughness=0.4):
+    """Return a shared material for this color/finish, creating it on first use"""
+    key = (tuple(rgba), metallic, roughness)
+    if key not in material_cache:
+        mat = bpy.data.materials.new(name=name)
+        mat.diffuse_color = rgba
+        mat.metallic = metallic
+        mat.roughness = roughness
+        material_cache[key] = mat
+    return material_cache[key]
+
+def add_keyframes(obj, data_path, index, frames, values):
+    """Write one F-curve's keys in bulk instead of a keyframe_insert per key"""
+    if obj.animation_data is None:
+        obj.animation_data_create()
+    if obj.animation_data.action is None:
+        obj.animation_data.action = bpy.data.actions.new(name=f"{obj.name}Action")
+    fcurve = obj.animation_data.action.fcurves.new(data_path=data_path, index=index)
+    fcurve.keyframe_points.add(len(frames))
+    co = np.empty(2 * len(frames), dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    fcurve.keyframe_points.foreach_set("co", co)
+    fcurve.update()
+
+def create_cylinder(name, radius, depth, location=(0, 0, 0), collection=None, scale=(1, 1, 1)):
+    return link_object(name, get_mesh("Cylinder", CYLINDER, (radius, radius, depth)), location, collection, scale)
+
+def create_cone(name, radius, depth, location=(0, 0, 0), collection=None, scale=(1, 1, 1)):
+    return link_object(name, get_mesh("Cone", CONE, (radius, radius, depth)), location, collection, scale)
+
+def create_sphere(name, radius, location=(0, 0, 0), collection=None, scale=(1, 1, 1)):
+    return link_object(name, get_mesh("Sphere", SPHERE, (radius, radius, radius)), location, collection, scale)
+
+# ===== ROBOT COLLECTION =====
+# Robot parts get their own collection so the export can take it as-is
+robot_coll = bpy.data.collections.new("Robot")
+bpy.context.scene.collection.children.link(robot_coll)
+
+# ===== MATERIALS =====
+table_mat = get_material("TableMaterial", (0.9, 0.9, 0.9, 1.0))  # White/gray
+base_mat = get_material("SurgicalBaseMat", (0.15, 0.15, 0.15, 1.0))  # Dark gray
+arm_mat = get_material("ArmMaterial", (0.3, 0.6, 0.8, 1.0))  # Light blue (medical)
+joint_mat = get_material("JointMaterial", (0.7, 0.7, 0.7, 1.0))
+inst_mat = get_material("InstrumentMaterial", (0.8, 0.8, 0.8, 1.0), metallic=0.9, roughness=0.2)  # Metallic
+tip_mat = get_material("TipMaterial", (0.1, 0.1, 0.1, 1.0))
+patient_mat = get_material("PatientMaterial", (0.95, 0.8, 0.7, 1.0))  # Skin tone
 
 # ===== OPERATING TABLE =====
 table = create_cylinder("OperatingTable", radius=1.5, depth=0.1, location=(0, 0, 0.8))
-table_mat = bpy.data.materials.new(name="TableMaterial")
-table_mat.diffuse_color = (0.9, 0.9, 0.9, 1.0)  # White/gray
-table.data.materials.append(table_mat)
+assign_material(table, table_mat)
 
 # ===== SURGICAL ROBOT ARM 1 (Right side) =====
 
 # Base column
-base1 = create_cylinder("SurgicalBase1", radius=0.2, depth=2.0, location=(-1.5, 0, 1.8))
-base1_mat = bpy.data.materials.new(name="SurgicalBaseMat")
-base1_mat.diffuse_color = (0.15, 0.15, 0.15, 1.0)  # Dark gray
-base1.data.materials.append(base1_mat)
+base1 = create_cylinder("SurgicalBase1", radius=0.2, depth=2.0, location=(-1.5, 0, 1.8), collection=robot_coll)
+assign_material(base1, base_mat)
 
 # Arm segment 1
-arm1_seg1 = create_cylinder("Arm1_Segment1", radius=0.08, depth=0.8, location=(-1.5, 0, 3.2))
+arm1_seg1 = create_cylinder("Arm1_Segment1", radius=0.08, depth=0.8, location=(-1.5, 0, 3.2), collection=robot_coll)
 arm1_seg1.rotation_euler[1] = math.radians(30)
-arm1_mat = bpy.data.materials.new(name="Arm1Material")
-arm1_mat.diffuse_color = (0.3, 0.6, 0.8, 1.0)  # Light blue (medical)
-arm1_seg1.data.materials.append(arm1_mat)
+assign_material(arm1_seg1, arm_mat)
 
 # Joint 1
-joint1 = create_sphere("Joint1", radius=0.12, location=(-1.3, 0, 3.5))
-joint1_mat = bpy.data.materials.new(name="JointMaterial")
-joint1_mat.diffuse_color = (0.7, 0.7, 0.7, 1.0)
-joint1.data.materials.append(joint1_mat)
+joint1 = create_sphere("Joint1", radius=0.12, location=(-1.3, 0, 3.5), collection=robot_coll)
+assign_material(joint1, joint_mat)
 
 # Arm segment 2
-arm1_seg2 = create_cylinder("Arm1_Segment2", radius=0.06, depth=0.6, location=(-1.0, 0, 3.7))
+arm1_seg2 = create_cylinder("Arm1_Segment2", radius=0.06, depth=0.6, location=(-1.0, 0, 3.7), collection=robot_coll)
 arm1_seg2.rotation_euler[1] = math.radians(-20)
-arm1_seg2.data.materials.append(arm1_mat)
+assign_material(arm1_seg2, arm_mat)
 
 # Surgical instrument (endoscope)
-instrument1 = create_cylinder("Endoscope", radius=0.02, depth=0.5, location=(-0.7, 0, 3.8))
+instrument1 = create_cylinder("Endoscope", radius=0.02, depth=0.5, location=(-0.7, 0, 3.8), collection=robot_coll)
 instrument1.rotation_euler[1] = math.radians(-10)
-inst_mat = bpy.data.materials.new(name="InstrumentMaterial")
-inst_mat.diffuse_color = (0.8, 0.8, 0.8, 1.0)  # Metallic
-inst_mat.metallic = 0.9
-inst_mat.roughness = 0.2
-instrument1.data.materials.append(inst_mat)
+assign_material(instrument1, inst_mat)
 
 # Instrument tip (camera/tool)
-tip1 = create_cone("EndoscopeTip", radius=0.03, depth=0.08, location=(-0.65, 0, 4.0))
+tip1 = create_cone("EndoscopeTip", radius=0.03, depth=0.08, location=(-0.65, 0, 4.0), collection=robot_coll)
 tip1.rotation_euler = (0, math.radians(-10), 0)
-tip_mat = bpy.data.materials.new(name="TipMaterial")
-tip_mat.diffuse_color = (0.1, 0.1, 0.1, 1.0)
-tip1.data.materials.append(tip_mat)
+assign_material(tip1, tip_mat)
 
 # ===== SURGICAL ROBOT ARM 2 (Left side - grasping tool) =====
 
-base2 = create_cylinder("SurgicalBase2", radius=0.2, depth=2.0, location=(1.5, 0, 1.8))
-base2.data.materials.append(base1_mat)
+base2 = create_cylinder("SurgicalBase2", radius=0.2, depth=2.0, location=(1.5, 0, 1.8), collection=robot_coll)
+assign_material(base2, base_mat)
 
-arm2_seg1 = create_cylinder("Arm2_Segment1", radius=0.08, depth=0.8, location=(1.5, 0, 3.2))
+arm2_seg1 = create_cylinder("Arm2_Segment1", radius=0.08, depth=0.8, location=(1.5, 0, 3.2), collection=robot_coll)
 arm2_seg1.rotation_euler[1] = math.radians(-30)
-arm2_seg1.data.materials.append(arm1_mat)
+assign_material(arm2_seg1, arm_mat)
 
-joint2 = create_sphere("Joint2", radius=0.12, location=(1.3, 0, 3.5))
-joint2.data.materials.append(joint1_mat)
+joint2 = create_sphere("Joint2", radius=0.12, location=(1.3, 0, 3.5), collection=robot_coll)
+assign_material(joint2, joint_mat)
 
-arm2_seg2 = create_cylinder("Arm2_Segment2", radius=0.06, depth=0.6, location=(1.0, 0, 3.7))
+arm2_seg2 = create_cylinder("Arm2_Segment2", radius=0.06, depth=0.6, location=(1.0, 0, 3.7), collection=robot_coll)
 arm2_seg2.rotation_euler[1] = math.radians(20)
-arm2_seg2.data.materials.append(arm1_mat)
+assign_material(arm2_seg2, arm_mat)
 
 # Grasping tool
-grasp_tool = create_cylinder("GraspTool", radius=0.02, depth=0.5, location=(0.7, 0, 3.8))
+grasp_tool = create_cylinder("GraspTool", radius=0.02, depth=0.5, location=(0.7, 0, 3.8), collection=robot_coll)
 grasp_tool.rotation_euler[1] = math.radians(10)
-grasp_tool.data.materials.append(inst_mat)
+assign_material(grasp_tool, inst_mat)
 
 # ===== PATIENT (simplified body) =====
-patient = create_cylinder("Patient", radius=0.4, depth=0.3, location=(0, 0, 1.0))
-patient.scale = (1.5, 1.0, 1.0)
-patient_mat = bpy.data.materials.new(name="PatientMaterial")
-patient_mat.diffuse_color = (0.95, 0.8, 0.7, 1.0)  # Skin tone
-patient.data.materials.append(patient_mat)
+patient = create_cylinder("Patient", radius=0.4, depth=0.3, location=(0, 0, 1.0), scale=(1.5, 1.0, 1.0))
+assign_material(patient, patient_mat)
 
 # ===== SETUP HIERARCHY =====
-arm1_seg1.parent = base1
-joint1.parent = arm1_seg1
-arm1_seg2.parent = joint1
-instrument1.parent = arm1_seg2
-tip1.parent = instrument1
-
-arm2_seg1.parent = base2
-joint2.parent = arm2_seg1
-arm2_seg2.parent = joint2
-grasp_tool.parent = arm2_seg2
+# (child, parent) chains for both arms; parent inverses stay identity, so each
+# part's location is relative to its parent, and matrices refresh once at the end
+hierarchy = [
+    (arm1_seg1, base1),
+    (joint1, arm1_seg1),
+    (arm1_seg2, joint1),
+    (instrument1, arm1_seg2),
+    (tip1, instrument1),
+
+    (arm2_seg1, base2),
+    (joint2, arm2_seg1),
+    (arm2_seg2, joint2),
+    (grasp_tool, arm2_seg2),
+]
+for child, parent in hierarchy:
+    child.parent = parent
+bpy.context.view_layer.update()
 
 # ===== ANIMATION =====
 fps = 30
@@ -129,65 +256,42 @@ bpy.context.scene.frame_end = total_frames
 bpy.context.scene.render.fps = fps
 
 # Animate arm 1 (scanning motion)
-arm1_seg1.rotation_euler[1] = math.radians(30)
-arm1_seg1.keyframe_insert(data_path="rotation_euler", frame=1)
-
-arm1_seg1.rotation_euler[1] = math.radians(10)
-arm1_seg1.keyframe_insert(data_path="rotation_euler", frame=60)
-
-arm1_seg1.rotation_euler[1] = math.radians(30)
-arm1_seg1.keyframe_insert(data_path="rotation_euler", frame=120)
+add_keyframes(arm1_seg1, "rotation_euler", 1, frames=(1, 60, 120),
+              values=(math.radians(30), math.radians(10), math.radians(30)))
 
 # Animate arm 2 (grasping motion)
-arm2_seg1.rotation_euler[1] = math.radians(-30)
-arm2_seg1.keyframe_insert(data_path="rotation_euler", frame=1)
-
-arm2_seg1.rotation_euler[1] = math.radians(-15)
-arm2_seg1.keyframe_insert(data_path="rotation_euler", frame=80)
-
-arm2_seg1.rotation_euler[1] = math.radians(-30)
-arm2_seg1.keyframe_insert(data_path="rotation_euler", frame=160)
+add_keyframes(arm2_seg1, "rotation_euler", 1, frames=(1, 80, 160),
+              values=(math.radians(-30), math.radians(-15), math.radians(-30)))
 
 # ===== LIGHTING =====
-bpy.ops.object.light_add(type='AREA', location=(0, -3, 4))
-light1 = bpy.context.active_object
-light1.data.energy = 500
-light1.data.size = 2
+light1_data = bpy.data.lights.new(name="Area", type='AREA')
+light1_data.energy = 500
+light1_data.size = 2
+light1 = link_object("Area", light1_data, (0, -3, 4))
 
-bpy.ops.object.light_add(type='AREA', location=(0, 3, 4))
-light2 = bpy.context.active_object
-light2.data.energy = 300
-light2.data.size = 2
+light2_data = bpy.data.lights.new(name="Area", type='AREA')
+light2_data.energy = 300
+light2_data.size = 2
+light2 = link_object("Area", light2_data, (0, 3, 4))
 
 # ===== CAMERA =====
-bpy.ops.object.camera_add(location=(3, -4, 3.5))
-camera = bpy.context.active_object
+camera = link_object("Camera", bpy.data.cameras.new(name="Camera"), (3, -4, 3.5))
 camera.rotation_euler = (math.radians(70), 0, math.radians(37))
 bpy.context.scene.camera = camera
 
 # ===== EXPORT =====
 output_path = "/Users/dr.gretchenboria/snaplock/public/models/surgical_robot_davinci.glb"
 
-# Select ONLY the robot components (not environment, lights, camera)
-bpy.ops.object.select_all(action='DESELECT')
-base1.select_set(True)
-arm1_seg1.select_set(True)
-joint1.select_set(True)
-arm1_seg2.select_set(True)
-instrument1.select_set(True)
-tip1.select_set(True)
-base2.select_set(True)
-arm2_seg1.select_set(True)
-joint2.select_set(True)
-arm2_seg2.select_set(True)
-grasp_tool.select_set(True)
+# Export ONLY the robot collection (not environment, lights, camera)
+view_layer = bpy.context.view_layer
+view_layer.active_layer_collection = view_layer.layer_collection.children[robot_coll.name]
 
 bpy.ops.export_scene.gltf(
     filepath=output_path,
     export_format='GLB',
     export_animations=True,
     export_yup=True,
-    use_selection=True
+    use_active_collection=True
 )
 
 print(f"✅ Created Da Vinci Style Surgical Robot")
@@ -5,14 +5,26 @@ Focuses on SimReady assets (physics-enabled) for ML training data generation
 """
 
 import os
-import requests
+import asyncio
+import hashlib
+import httpx
 import json
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
 import subprocess
 import shutil
+from tqdm import tqdm
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Asset configuration - curated subset for robotics/VR ML training
+# (an entry may also pin "sha256" to verify the downloaded zip against)
 NVIDIA_ASSETS = {
     "simready_warehouse_01": {
         "url": "https://omniverse-content-production.s3-us-west-2.amazonaws.com/Assets/ArchVis/Commercial/Warehouse/SimReady_Props_Warehouse_01.zip",
@@ -34,125 +46,325 @@ NVIDIA_ASSETS = {
     }
 }
 
+# Read/write size for streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Large packs are fetched as this many parallel Range requests, one TCP connection each
+DOWNLOAD_CONNECTIONS = 8
+RANGED_DOWNLOAD_MIN_SIZE = 64 << 20
+DOWNLOAD_TIMEOUT = httpx.Timeout(30.0)
+
+# Extraction is split into this many member batches so DEFLATE runs on every core
+EXTRACT_TASKS = (os.cpu_count() or 1) * 4
+
+# USD files per headless Blender session: amortizes startup while still
+# spreading a large pack across the worker pool
+BLENDER_BATCH_SIZE = 50
+
+def split_ranges(total_size: int) -> List[Tuple[int, int]]:
+    """Inclusive byte ranges for a DOWNLOAD_CONNECTIONS-way download (stable across runs for resume)"""
+    part_size = -(-total_size // DOWNLOAD_CONNECTIONS)
+    return [(start, min(start + part_size, total_size) - 1) for start in range(0, total_size, part_size)]
+
+async def download_range(client: httpx.AsyncClient, url: str, start: int, end: int, path: Path, progress: tqdm,
+                         etag: Optional[str]):
+    """Fetch bytes start..end (inclusive) into their slot of the preallocated file"""
+    headers = {'Range': f"bytes={start}-{end}"}
+    if etag:
+        headers['If-Range'] = etag
+    async with client.stream('GET', url, headers=headers) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise RuntimeError(f"server ignored Range request or file changed upstream (HTTP {response.status_code})")
+        with open(path, 'r+b') as f:
+            f.seek(start)
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                progress.update(len(chunk))
+
+async def download_ranges(url: str, path: Path, ranges: List[Tuple[int, int]], progress: tqdm,
+                          etag: Optional[str], on_range_done: Callable[[int, int], None]):
+    """Download the given ranges of url into path concurrently, reporting each as it completes"""
+    async def fetch(client, start, end):
+        await download_range(client, url, start, end, path, progress, etag)
+        on_range_done(start, end)
+
+    limits = httpx.Limits(max_connections=DOWNLOAD_CONNECTIONS)
+    async with httpx.AsyncClient(follow_redirects=True, timeout=DOWNLOAD_TIMEOUT, limits=limits) as client:
+        await asyncio.gather(*(fetch(client, start, end) for start, end in ranges))
+
+def sha256_file(path: Path) -> str:
+    """SHA256 of a file, read in 1 MiB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def is_safe_member(extract_dir: Path, name: str) -> bool:
+    """Whether a zip member name stays inside extract_dir (no absolute paths or '..' escapes)"""
+    root = extract_dir.resolve()
+    return (root / name).resolve().is_relative_to(root)
+
+def extract_members(zip_path: Path, extract_dir: Path, names: List[str]) -> int:
+    """Extract the named zip members, skipping ones already on disk at full size (runs in a worker process)"""
+    extracted = 0
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for name in names:
+            info = zip_ref.getinfo(name)
+            target = extract_dir / name
+            if target.exists() and (info.is_dir() or target.stat().st_size == info.file_size):
+                continue
+            zip_ref.extract(info, extract_dir)
+            extracted += 1
+    return extracted
+
+# Converts every (usd, glb) pair listed in the jobs JSON inside one Blender session,
+# appending and flushing one success flag per job to the results file so a
+# crash partway through still leaves the finished jobs on record
+BLENDER_BATCH_SCRIPT = """
+import bpy, json, sys
+jobs_path, results_path = sys.argv[sys.argv.index("--") + 1:]
+with open(jobs_path) as f:
+    jobs = json.load(f)
+with open(results_path, 'w') as results:
+    for usd_file, output_path in jobs:
+        try:
+            bpy.ops.wm.read_factory_settings(use_empty=True)
+            bpy.ops.wm.usd_import(filepath=usd_file)
+            bpy.ops.export_scene.gltf(filepath=output_path, export_format='GLB')
+            ok = True
+        except Exception as e:
+            print(f"Failed to convert {usd_file}: {e}")
+            ok = False
+        results.write(json.dumps(ok) + "\\n")
+        results.flush()
+"""
+
+def convert_with_usd2gltf(usd_file: Path, output_path: Path) -> bool:
+    """Convert one USD file with usd2gltf (runs in a worker process)"""
+    try:
+        subprocess.run([
+            'usd2gltf',
+            str(usd_file),
+            '-o', str(output_path)
+        ], check=True, capture_output=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"   ✗ usd2gltf failed: {e}")
+        return False
+
+def convert_with_blender(jobs: List[Tuple[Path, Path]], work_dir: Path, name: str) -> List[bool]:
+    """Convert all jobs in a single headless Blender session (runs in a worker process)"""
+    jobs_path = work_dir / f"{name}_jobs.json"
+    results_path = work_dir / f"{name}_results.json"
+    jobs_path.write_text(json.dumps([[str(usd_file), str(output_path)] for usd_file, output_path in jobs]))
+    results_path.unlink(missing_ok=True)
+
+    try:
+        subprocess.run([
+            'blender',
+            '--background',
+            '--python-expr', BLENDER_BATCH_SCRIPT,
+            '--', str(jobs_path), str(results_path)
+        ], check=True, capture_output=True)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"   ✗ Blender conversion failed: {e}")
+
+    # Jobs after a crash have no result line and count as failed
+    results = []
+    if results_path.exists():
+        for line in results_path.read_text().splitlines():
+            try:
+                results.append(json.loads(line) is True)
+            except ValueError:
+                break  # torn line from the crash
+    return results + [False] * (len(jobs) - len(results))
+
+def to_json_line(record: Dict) -> bytes:
+    """Serialize one JSONL registry line"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record) + "\n").encode()
+
+def from_json_line(line: bytes) -> Dict:
+    """Parse one JSONL registry line"""
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
 class AssetPipeline:
     def __init__(self, base_dir: str = "."):
         self.base_dir = Path(base_dir)
         self.download_dir = self.base_dir / "downloads" / "usd"
         self.output_dir = self.base_dir / "public" / "assets"
         self.metadata_file = self.output_dir / "asset_registry.json"
+        # Append-only log of converted assets; asset_registry.json is aggregated from it
+        self.records_file = self.metadata_file.with_suffix('.jsonl')
 
         # Create directories
         self.download_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.registry: Dict[str, List[Dict]] = {}
+        self.converted_ids = set()
+        self.records = None
+
+        # One client so every pack download reuses the pooled TLS connection
+        self.client = httpx.Client(follow_redirects=True, timeout=DOWNLOAD_TIMEOUT)
+
+        # Packs run on their own threads; this guards the records file and progress bar
+        self.lock = threading.Lock()
+        self.progress = None
+
+    def download_asset_pack(self, pack_id: str, config: Dict) -> Tuple[Path, str]:
+        """Download a NVIDIA asset pack, returning the zip path and its SHA256
 
-    def download_asset_pack(self, pack_id: str, config: Dict) -> Path:
-        """Download a NVIDIA asset pack"""
+        <pack_id>.meta.json records the ETag, size and SHA256 of the finished zip,
+        or the ranges already on disk for an unfinished one. Re-runs revalidate
+        with a conditional HEAD and resume partial downloads instead of starting
+        over.
+        """
         print(f"\n📦 Downloading {pack_id}...")
         print(f"   {config['description']}")
 
+        url = config['url']
         zip_path = self.download_dir / f"{pack_id}.zip"
-
-        if zip_path.exists():
-            print(f"   ✓ Already downloaded: {zip_path}")
-            return zip_path
+        meta_path = self.download_dir / f"{pack_id}.meta.json"
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+        complete = meta.get('complete') and zip_path.exists() and zip_path.stat().st_size == meta.get('size')
 
         try:
-            response = requests.get(config['url'], stream=True)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-
-            with open(zip_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        percent = (downloaded / total_size) * 100
-                        print(f"\r   Progress: {percent:.1f}%", end='', flush=True)
-
-            print(f"\n   ✓ Downloaded: {zip_path}")
-            return zip_path
+            try:
+                head = self.client.head(url, headers={'If-None-Match': meta['etag']} if complete and meta.get('etag') else {})
+                if head.status_code != 304:
+                    head.raise_for_status()
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if not complete:
+                    raise
+                # A verified local copy beats failing on an unreachable or erroring server
+                print(f"   ⚠️  Could not revalidate ({e}), using local copy: {zip_path}")
+                return zip_path, meta['sha256']
+
+            etag = head.headers.get('etag')
+            if complete and (head.status_code == 304 or (etag and etag == meta.get('etag'))):
+                print(f"   ✓ Already downloaded: {zip_path}")
+                return zip_path, meta['sha256']
+
+            total_size = int(head.headers.get('content-length', 0))
+
+            # Only an unfinished download of this exact upstream file can be resumed
+            resumable = (not complete and etag and meta.get('etag') == etag
+                         and meta.get('size') == total_size and zip_path.exists())
+            if not resumable:
+                zip_path.unlink(missing_ok=True)
+                meta = {'etag': etag, 'size': total_size, 'complete': False}
+                meta_path.write_text(json.dumps(meta))
+
+            # tqdm redraws on a timer, so progress output no longer scales with chunk count
+            with tqdm(total=total_size or None, desc=pack_id, unit='B', unit_scale=True, unit_divisor=1024) as progress:
+                if head.headers.get('accept-ranges') == 'bytes' and total_size >= RANGED_DOWNLOAD_MIN_SIZE:
+                    done = {tuple(r) for r in meta.get('ranges_done', [])}
+                    if not zip_path.exists():
+                        with open(zip_path, 'wb') as f:
+                            f.truncate(total_size)
+                    progress.update(sum(end - start + 1 for start, end in done))
+
+                    def range_done(start: int, end: int):
+                        meta.setdefault('ranges_done', []).append([start, end])
+                        meta_path.write_text(json.dumps(meta))
+
+                    pending = [r for r in split_ranges(total_size) if r not in done]
+                    asyncio.run(download_ranges(url, zip_path, pending, progress, etag, range_done))
+                    # Ranges land out of order, so this path hashes the finished file
+                    digest = sha256_file(zip_path)
+                else:
+                    start = zip_path.stat().st_size if zip_path.exists() else 0
+                    if start > total_size > 0:
+                        start = 0
+
+                    if start and start == total_size:
+                        progress.update(start)
+                        digest = sha256_file(zip_path)
+                    else:
+                        # Hash while streaming so the zip is never re-read from disk
+                        hasher = hashlib.sha256()
+                        headers = {'Range': f"bytes={start}-", 'If-Range': etag} if start else {}
+                        with self.client.stream('GET', url, headers=headers) as response:
+                            response.raise_for_status()
+                            if response.status_code != 206:
+                                start = 0  # server sent the whole file
+
+                            if start:
+                                # Fold the bytes already on disk into the hash, then append
+                                with open(zip_path, 'rb') as f:
+                                    while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+                                        hasher.update(chunk)
+                                progress.update(start)
+
+                            with open(zip_path, 'ab' if start else 'wb') as f:
+                                for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                                    hasher.update(chunk)
+                                    f.write(chunk)
+                                    progress.update(len(chunk))
+                        digest = hasher.hexdigest()
+
+            if config.get('sha256') and digest != config['sha256']:
+                zip_path.unlink(missing_ok=True)
+                meta_path.unlink(missing_ok=True)
+                raise ValueError(f"SHA256 mismatch: expected {config['sha256']}, got {digest}")
+            meta_path.write_text(json.dumps({'etag': etag, 'size': total_size, 'sha256': digest, 'complete': True}))
+
+            print(f"\n   ✓ Downloaded: {zip_path} (sha256 {digest})")
+            return zip_path, digest
 
         except Exception as e:
             print(f"\n   ✗ Failed to download: {e}")
+            if zip_path.exists() and not meta.get('complete'):
+                print(f"   ℹ️  Partial download kept for the next run to resume")
             raise
 
-    def extract_pack(self, zip_path: Path, pack_id: str) -> Path:
-        """Extract USD asset pack"""
+    def extract_pack(self, zip_path: Path, pack_id: str, pool: ProcessPoolExecutor) -> Path:
+        """Extract USD asset pack, spreading members across the worker pool"""
         extract_dir = self.download_dir / pack_id
 
-        if extract_dir.exists():
-            print(f"   ✓ Already extracted: {extract_dir}")
-            return extract_dir
-
         print(f"   📂 Extracting {zip_path.name}...")
 
         try:
-            import zipfile
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-            print(f"   ✓ Extracted to: {extract_dir}")
+                names = zip_ref.namelist()
+
+            # Skip checks and mkdir below use member paths directly, so drop any that escape
+            safe = [name for name in names if is_safe_member(extract_dir, name)]
+            if len(safe) < len(names):
+                print(f"   ⚠️  Skipping {len(names) - len(safe)} zip members with unsafe paths")
+            names = safe
+
+            # Create the directory tree up front so workers don't race on makedirs
+            for directory in {(extract_dir / name).parent for name in names}:
+                directory.mkdir(parents=True, exist_ok=True)
+
+            batches = [names[i::EXTRACT_TASKS] for i in range(min(EXTRACT_TASKS, len(names)))]
+            futures = [pool.submit(extract_members, zip_path, extract_dir, batch) for batch in batches]
+            extracted = sum(future.result() for future in futures)
+
+            if extracted:
+                print(f"   ✓ Extracted {extracted} files to: {extract_dir}")
+            else:
+                print(f"   ✓ Already extracted: {extract_dir}")
             return extract_dir
         except Exception as e:
             print(f"   ✗ Failed to extract: {e}")
             raise
 
     def find_usd_files(self, directory: Path) -> List[Path]:
-        """Find all USD files in directory"""
-        usd_extensions = ['.usd', '.usda', '.usdc', '.usdz']
+        """Find all USD files in directory with a single tree walk"""
+        usd_extensions = ('.usd', '.usda', '.usdc', '.usdz')
         usd_files = []
 
-        for ext in usd_extensions:
-            usd_files.extend(directory.rglob(f'*{ext}'))
-
-        return usd_files
-
-    def convert_usd_to_gltf(self, usd_file: Path, output_path: Path) -> bool:
-        """Convert USD file to GLTF using available tools"""
-        print(f"   🔄 Converting {usd_file.name}...")
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(usd_extensions):
+                    usd_files.append(Path(root) / name)
 
-        # Try usd2gltf if available
-        if shutil.which('usd2gltf'):
-            try:
-                subprocess.run([
-                    'usd2gltf',
-                    str(usd_file),
-                    '-o', str(output_path)
-                ], check=True, capture_output=True)
-                print(f"   ✓ Converted: {output_path.name}")
-                return True
-            except subprocess.CalledProcessError as e:
-                print(f"   ✗ usd2gltf failed: {e}")
-
-        # Try Blender USD import/export if available
-        if shutil.which('blender'):
-            try:
-                blender_script = f"""
-import bpy
-bpy.ops.wm.usd_import(filepath="{usd_file}")
-bpy.ops.export_scene.gltf(filepath="{output_path}", export_format='GLB')
-bpy.ops.wm.quit_blender()
-"""
-                script_path = self.download_dir / "convert.py"
-                script_path.write_text(blender_script)
-
-                subprocess.run([
-                    'blender',
-                    '--background',
-                    '--python', str(script_path)
-                ], check=True, capture_output=True)
-
-                print(f"   ✓ Converted via Blender: {output_path.name}")
-                return True
-            except subprocess.CalledProcessError as e:
-                print(f"   ✗ Blender conversion failed: {e}")
-
-        print(f"   ⚠️  No USD converter available (tried: usd2gltf, blender)")
-        print(f"   ℹ️  Install: pip install usd-core gltfpack")
-        return False
+        return sorted(usd_files)
 
     def generate_thumbnail(self, gltf_path: Path, thumbnail_path: Path) -> bool:
         """Generate thumbnail preview of 3D model"""
@@ -160,57 +372,146 @@ bpy.ops.wm.quit_blender()
         # For now, placeholder
         return False
 
-    def process_asset_pack(self, pack_id: str, config: Dict):
+    def advance_progress(self, count: int):
+        """Advance the shared conversion progress bar"""
+        with self.lock:
+            self.progress.update(count)
+
+    def append_record(self, asset_metadata: Dict):
+        """Append one converted asset to the JSONL registry as soon as it exists"""
+        line = to_json_line(asset_metadata)
+        with self.lock:
+            self.records.write(line)
+            self.records.flush()
+
+    def load_records(self) -> Dict[str, Dict]:
+        """Read the JSONL registry, keeping the latest record per asset id"""
+        records = {}
+        if self.records_file.exists():
+            with open(self.records_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = from_json_line(line)
+                    except ValueError:
+                        continue  # blank or torn line from an interrupted run
+                    records[record['id']] = record
+        return records
+
+    def convert_usd_files(self, jobs: List[Tuple[Path, Path]], pack_id: str, pool: ProcessPoolExecutor,
+                          on_converted: Callable[[int], None]) -> int:
+        """Convert (usd_file, output_path) jobs to GLB, calling on_converted(index) per success
+
+        usd2gltf runs per file across the worker pool; whatever it can't handle
+        goes to headless Blender sessions of up to BLENDER_BATCH_SIZE files, so
+        Blender's startup is paid once per batch instead of once per file.
+        """
+        with self.lock:
+            self.progress.total += len(jobs)
+            self.progress.refresh()
+
+        converted = 0
+        remaining = list(range(len(jobs)))
+
+        if shutil.which('usd2gltf'):
+            futures = {pool.submit(convert_with_usd2gltf, *jobs[i]): i for i in remaining}
+            remaining = []
+            for future in as_completed(futures):
+                i = futures[future]
+                if future.result():
+                    on_converted(i)
+                    converted += 1
+                    self.advance_progress(1)
+                else:
+                    remaining.append(i)
+            remaining.sort()
+
+        if remaining and shutil.which('blender'):
+            batches = [remaining[start:start + BLENDER_BATCH_SIZE] for start in range(0, len(remaining), BLENDER_BATCH_SIZE)]
+            futures = {
+                pool.submit(convert_with_blender, [jobs[i] for i in batch], self.download_dir, f"{pack_id}_{n}"): batch
+                for n, batch in enumerate(batches)
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                for i, ok in zip(batch, future.result()):
+                    if ok:
+                        on_converted(i)
+                        converted += 1
+                self.advance_progress(len(batch))
+        elif remaining:
+            if not shutil.which('usd2gltf'):
+                print(f"   ⚠️  No USD converter available (tried: usd2gltf, blender)")
+                print(f"   ℹ️  Install: pip install usd-core gltfpack")
+            self.advance_progress(len(remaining))
+
+        return converted
+
+    def process_asset_pack(self, pack_id: str, config: Dict, pool: ProcessPoolExecutor):
         """Download, extract, convert, and catalog asset pack"""
         print(f"\n{'='*60}")
         print(f"Processing: {pack_id}")
         print(f"{'='*60}")
 
         # Download
-        zip_path = self.download_asset_pack(pack_id, config)
+        zip_path, pack_sha256 = self.download_asset_pack(pack_id, config)
 
         # Extract
-        extract_dir = self.extract_pack(zip_path, pack_id)
+        extract_dir = self.extract_pack(zip_path, pack_id, pool)
 
         # Find USD files
         usd_files = self.find_usd_files(extract_dir)
         print(f"\n   Found {len(usd_files)} USD files")
 
-        # Convert to GLTF
+        # Convert to GLTF, skipping assets an earlier run already recorded
         category_dir = self.output_dir / config['category']
         category_dir.mkdir(exist_ok=True)
 
-        converted_assets = []
-
-        for i, usd_file in enumerate(usd_files[:10]):  # Limit to first 10 for testing
-            asset_name = usd_file.stem
+        jobs = []
+        asset_names = []
+        for usd_file in usd_files:
+            # Packs reuse file names across folders, so name assets by their path in the pack
+            asset_name = "_".join(usd_file.relative_to(extract_dir).with_suffix('').parts)
             gltf_output = category_dir / f"{asset_name}.glb"
+            if f"{pack_id}_{asset_name}" in self.converted_ids and gltf_output.exists():
+                continue
+            jobs.append((usd_file, gltf_output))
+            asset_names.append(asset_name)
+
+        if len(jobs) < len(usd_files):
+            print(f"   ✓ Already converted: {len(usd_files) - len(jobs)} assets")
 
-            if self.convert_usd_to_gltf(usd_file, gltf_output):
-                asset_metadata = {
-                    "id": f"{pack_id}_{asset_name}",
-                    "name": asset_name.replace('_', ' ').title(),
-                    "path": f"/assets/{config['category']}/{asset_name}.glb",
-                    "category": config['category'],
-                    "physics_enabled": config['physics'],
-                    "source": "NVIDIA Omniverse",
-                    "thumbnail": f"/assets/{config['category']}/{asset_name}_thumb.jpg"
-                }
-                converted_assets.append(asset_metadata)
-
-        # Update registry
-        if config['category'] not in self.registry:
-            self.registry[config['category']] = []
-        self.registry[config['category']].extend(converted_assets)
-
-        print(f"\n   ✓ Processed {len(converted_assets)} assets")
+        def record(index: int):
+            asset_name = asset_names[index]
+            self.append_record({
+                "id": f"{pack_id}_{asset_name}",
+                "name": jobs[index][0].stem.replace('_', ' ').title(),
+                "path": f"/assets/{config['category']}/{asset_name}.glb",
+                "category": config['category'],
+                "physics_enabled": config['physics'],
+                "source": "NVIDIA Omniverse",
+                "source_sha256": pack_sha256,
+                "thumbnail": f"/assets/{config['category']}/{asset_name}_thumb.jpg"
+            })
+
+        converted = self.convert_usd_files(jobs, pack_id, pool, record)
+
+        print(f"\n   ✓ Processed {converted} assets")
 
     def save_registry(self):
-        """Save asset registry to JSON"""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.registry, f, indent=2)
+        """Aggregate the JSONL records into asset_registry.json grouped by category"""
+        registry: Dict[str, List[Dict]] = {}
+        for record in self.load_records().values():
+            registry.setdefault(record['category'], []).append(record)
+
+        if orjson is not None:
+            self.metadata_file.write_bytes(
+                orjson.dumps(registry, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        else:
+            with open(self.metadata_file, 'w') as f:
+                json.dump(registry, f, indent=2)
+                f.write("\n")
         print(f"\n📋 Asset registry saved: {self.metadata_file}")
-        print(f"   Total assets: {sum(len(assets) for assets in self.registry.values())}")
+        print(f"   Total assets: {sum(len(assets) for assets in registry.values())}")
 
     def run(self):
         """Run full pipeline"""
@@ -222,14 +523,26 @@ bpy.ops.wm.quit_blender()
         print("\nRequired tools:")
         print("  - usd2gltf (pip install usd-core) OR")
         print("  - Blender 3.0+ with USD support")
+        print("  - httpx, tqdm (pip install httpx tqdm)")
         print("\n" + "="*60)
 
-        for pack_id, config in NVIDIA_ASSETS.items():
-            try:
-                self.process_asset_pack(pack_id, config)
-            except Exception as e:
-                print(f"\n✗ Failed to process {pack_id}: {e}")
-                continue
+        self.converted_ids = set(self.load_records())
+
+        # Packs download concurrently on threads; extraction and conversion are
+        # CPU-bound subprocess work shared across one process per core
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool, \
+                ThreadPoolExecutor(max_workers=len(NVIDIA_ASSETS)) as packs, \
+                tqdm(total=0, desc="Converting", unit="asset") as self.progress, \
+                open(self.records_file, 'ab') as self.records:
+            futures = {
+                packs.submit(self.process_asset_pack, pack_id, config, pool): pack_id
+                for pack_id, config in NVIDIA_ASSETS.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"\n✗ Failed to process {futures[future]}: {e}")
 
         self.save_registry()
 
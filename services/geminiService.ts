@@ -1382,7 +1382,7 @@ export const generateCreativePrompt = async (): Promise<string> => {
 /**
  * Generates a photorealistic image from a scene description using Imagen 3.0
  * @param sceneDescription - Natural language description of the scene
- * @returns Base64-encoded photorealistic image
+ * @returns Image URL (object URL from the local SD server, otherwise a base64 data URL)
  */
 export const generatePhotorealisticScene = async (sceneDescription: string): Promise<string> => {
   if (isTestMode()) {
@@ -1407,11 +1407,10 @@ export const generatePhotorealisticScene = async (sceneDescription: string): Pro
     });
 
     if (sdResponse.ok) {
-      const result = await sdResponse.json();
-      if (result.success && result.image) {
-        console.log('[generatePhotorealisticScene] Successfully generated with Stable Diffusion');
-        return result.image;
-      }
+      // Server returns the raw JPEG bytes; hand them to the UI as an object URL
+      const imageBlob = await sdResponse.blob();
+      console.log('[generatePhotorealisticScene] Successfully generated with Stable Diffusion');
+      return URL.createObjectURL(imageBlob);
     }
 
     console.warn('[generatePhotorealisticScene] Local SD server unavailable, trying cloud APIs...');